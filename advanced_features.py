@@ -2,19 +2,41 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta, time
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
+import calendar
 import time as time_module
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
+from functools import lru_cache
 import re
+import sys
 from collections import defaultdict, Counter
+from statistics import fmean
 from utils import *
 
+try:
+    from numba import njit  # Optional JIT for the tight numeric loops below
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the function as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10; older versions get plain dataclasses
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Widgets inside a fragment rerun only that fragment; Streamlit < 1.37 reruns the whole script instead
+fragment = getattr(st, 'fragment', lambda func: func)
+FRAGMENTS_SUPPORTED = hasattr(st, 'fragment')
+
+
+def timed_fragment(run_every: float):
+    """Fragment that also reruns itself every run_every seconds; a no-op without fragment support"""
+    return st.fragment(run_every=run_every) if FRAGMENTS_SUPPORTED else (lambda func: func)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ProductivityGoal:
     """Represents a productivity goal"""
     id: str
@@ -28,7 +50,7 @@ class ProductivityGoal:
     completed: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TimeBlock:
     """Represents a time block for time blocking"""
     id: str
@@ -45,68 +67,55 @@ class AdvancedTaskAnalyzer:
     """Advanced task analysis and insights"""
 
     @staticmethod
-    def analyze_completion_patterns(tasks: List[Dict]) -> Dict:
+    def analyze_completion_patterns(tasks: Union[List[Dict], TaskStore]) -> Dict:
         """Analyze task completion patterns"""
-        completed_tasks = [t for t in tasks if t['status'] == 'completed' and t.get('completed_at')]
+        df = TaskStore.of(tasks).frame
+        completed_tasks = df[(df['status'] == 'completed') & df['completed_at'].fillna('').astype(bool)]
 
-        if not completed_tasks:
+        if completed_tasks.empty:
             return {}
 
         patterns = {
-            'hourly_distribution': defaultdict(int),
-            'daily_distribution': defaultdict(int),
-            'monthly_distribution': defaultdict(int),
-            'priority_completion_times': defaultdict(list),
-            'list_completion_times': defaultdict(list),
+            'hourly_distribution': {},
+            'daily_distribution': {},
+            'monthly_distribution': {},
+            'priority_completion_times': {},
+            'list_completion_times': {},
             'completion_streaks': [],
             'most_productive_periods': {}
         }
 
-        for task in completed_tasks:
-            try:
-                completed_dt = datetime.fromisoformat(task['completed_at'])
-                created_dt = datetime.fromisoformat(task['created_at'])
-
-                # Time distributions
-                patterns['hourly_distribution'][completed_dt.hour] += 1
-                patterns['daily_distribution'][completed_dt.strftime('%A')] += 1
-                patterns['monthly_distribution'][completed_dt.strftime('%B')] += 1
-
-                # Completion time by priority and list
-                completion_time_hours = (completed_dt - created_dt).total_seconds() / 3600
-                patterns['priority_completion_times'][task['priority']].append(completion_time_hours)
-                patterns['list_completion_times'][task['list_name']].append(completion_time_hours)
-
-            except (ValueError, TypeError):
-                continue
-
-        # Calculate averages
-        for priority, times in patterns['priority_completion_times'].items():
-            patterns['priority_completion_times'][priority] = {
-                'average': np.mean(times),
-                'median': np.median(times),
-                'count': len(times)
-            }
-
-        for list_name, times in patterns['list_completion_times'].items():
-            patterns['list_completion_times'][list_name] = {
-                'average': np.mean(times),
-                'median': np.median(times),
-                'count': len(times)
+        # Unparseable timestamps are NaT in the store and drop out here
+        valid = completed_tasks['completed_ts'].notna() & completed_tasks['created_ts'].notna()
+
+        if not valid.any():
+            return patterns
+
+        completed_dt = completed_tasks.loc[valid, 'completed_ts']
+        df = completed_tasks[valid].assign(
+            hours=(completed_dt - completed_tasks.loc[valid, 'created_ts']).dt.total_seconds() / 3600)
+
+        # Time distributions over fixed bucket domains
+        hourly = np.bincount(completed_dt.dt.hour.to_numpy(), minlength=24)
+        daily = np.bincount(completed_dt.dt.dayofweek.to_numpy(), minlength=7)
+        monthly = np.bincount(completed_dt.dt.month.to_numpy(), minlength=13)
+        patterns['hourly_distribution'] = {hour: int(count) for hour, count in enumerate(hourly) if count}
+        patterns['daily_distribution'] = {calendar.day_name[day]: int(count)
+                                          for day, count in enumerate(daily) if count}
+        patterns['monthly_distribution'] = {calendar.month_name[month]: int(count)
+                                            for month, count in enumerate(monthly) if count}
+
+        # Completion time by priority and list
+        for column, key in (('priority', 'priority_completion_times'), ('list_name', 'list_completion_times')):
+            stats = df.groupby(column, observed=True)['hours'].agg(['mean', 'median', 'count'])
+            patterns[key] = {
+                name: {'average': row['mean'], 'median': row['median'], 'count': int(row['count'])}
+                for name, row in stats.iterrows()
             }
 
         # Find most productive periods
-        if patterns['hourly_distribution']:
-            patterns['most_productive_periods']['hour'] = max(
-                patterns['hourly_distribution'],
-                key=patterns['hourly_distribution'].get
-            )
-
-        if patterns['daily_distribution']:
-            patterns['most_productive_periods']['day'] = max(
-                patterns['daily_distribution'],
-                key=patterns['daily_distribution'].get
-            )
+        patterns['most_productive_periods']['hour'] = int(hourly.argmax())
+        patterns['most_productive_periods']['day'] = calendar.day_name[int(daily.argmax())]
 
         return patterns
 
@@ -116,49 +125,29 @@ class AdvancedTaskAnalyzer:
         if not historical_data:
             return 2.0  # Default 2 hours
 
-        # Filter similar tasks
-        similar_tasks = []
-        for hist_task in historical_data:
-            if (hist_task['status'] == 'completed' and
-                    hist_task.get('completed_at') and
-                    hist_task.get('created_at')):
-
-                similarity_score = 0
-
-                # Same priority
-                if hist_task['priority'] == task['priority']:
-                    similarity_score += 0.3
-
-                # Same list
-                if hist_task['list_name'] == task['list_name']:
-                    similarity_score += 0.2
-
-                # Similar title (simple word matching)
-                task_words = set(task['title'].lower().split())
-                hist_words = set(hist_task['title'].lower().split())
-                if task_words & hist_words:  # Common words
-                    similarity_score += 0.2
-
-                # Similar tags
-                task_tags = set(task.get('tags', []))
-                hist_tags = set(hist_task.get('tags', []))
-                if task_tags & hist_tags:
-                    similarity_score += 0.1
-
-                if similarity_score > 0.3:  # Threshold for similarity
-                    try:
-                        completed_dt = datetime.fromisoformat(hist_task['completed_at'])
-                        created_dt = datetime.fromisoformat(hist_task['created_at'])
-                        completion_time = (completed_dt - created_dt).total_seconds() / 3600
-                        similar_tasks.append((completion_time, similarity_score))
-                    except (ValueError, TypeError):
-                        continue
-
-        if similar_tasks:
-            # Weighted average based on similarity
-            total_weight = sum(weight for _, weight in similar_tasks)
-            weighted_sum = sum(time * weight for time, weight in similar_tasks)
-            return weighted_sum / total_weight
+        index = get_cached_for_tasks('history_index_cache', historical_data,
+                                     AdvancedTaskAnalyzer._build_history_index)
+        hours = index['hours']
+
+        if len(hours):
+            # Similar title (simple word matching) and similar tags via the inverted indexes
+            word_match = np.zeros(len(hours), dtype=bool)
+            for word in set(task['title'].lower().split()):
+                word_match[index['word_index'].get(word, [])] = True
+
+            tag_match = np.zeros(len(hours), dtype=bool)
+            for tag in set(task.get('tags', [])):
+                tag_match[index['tag_index'].get(tag, [])] = True
+
+            similarity_scores = (0.3 * (index['priorities'] == task['priority']) +
+                                 0.2 * (index['lists'] == task['list_name']) +
+                                 0.2 * word_match +
+                                 0.1 * tag_match)
+            similar = similarity_scores > 0.3  # Threshold for similarity
+
+            if similar.any():
+                # Weighted average based on similarity
+                return float(np.average(hours[similar], weights=similarity_scores[similar]))
 
         # Fallback to priority-based estimation
         priority_estimates = {
@@ -171,7 +160,36 @@ class AdvancedTaskAnalyzer:
         return priority_estimates.get(task['priority'], 2.0)
 
     @staticmethod
-    def detect_procrastination_patterns(tasks: List[Dict]) -> Dict:
+    def _build_history_index(historical_data: List[Dict]) -> Dict:
+        """Index completed tasks by title word and tag for similarity lookups"""
+        completed = []
+        for hist_task in historical_data:
+            if hist_task['status'] != 'completed':
+                continue
+
+            completed_dt = parse_iso_datetime(hist_task.get('completed_at'))
+            created_dt = parse_iso_datetime(hist_task.get('created_at'))
+            if completed_dt and created_dt:
+                completed.append((hist_task, (completed_dt - created_dt).total_seconds() / 3600))
+
+        word_index = defaultdict(list)
+        tag_index = defaultdict(list)
+        for i, (hist_task, _) in enumerate(completed):
+            for word in set(hist_task['title'].lower().split()):
+                word_index[word].append(i)
+            for tag in set(hist_task.get('tags', [])):
+                tag_index[tag].append(i)
+
+        return {
+            'hours': np.array([hours for _, hours in completed], dtype=float),
+            'priorities': np.array([t['priority'] for t, _ in completed], dtype=object),
+            'lists': np.array([t['list_name'] for t, _ in completed], dtype=object),
+            'word_index': dict(word_index),
+            'tag_index': dict(tag_index)
+        }
+
+    @staticmethod
+    def detect_procrastination_patterns(tasks: Union[List[Dict], TaskStore]) -> Dict:
         """Detect procrastination patterns in task behavior"""
         patterns = {
             'overdue_by_priority': defaultdict(int),
@@ -181,30 +199,59 @@ class AdvancedTaskAnalyzer:
             'avoidance_categories': defaultdict(int)
         }
 
-        today = date.today()
+        df = TaskStore.of(tasks).frame
+        due_day = df['due_ts'].dt.normalize()
+        completed = df['status'] == 'completed'
 
-        for task in tasks:
-            # Overdue analysis
-            if (task.get('due_date') and task['status'] != 'completed' and
-                    datetime.fromisoformat(task['due_date']).date() < today):
-                patterns['overdue_by_priority'][task['priority']] += 1
-                patterns['avoidance_categories'][task['list_name']] += 1
-
-            # Last minute completion analysis
-            if (task['status'] == 'completed' and task.get('due_date') and
-                    task.get('completed_at')):
-                try:
-                    due_date = datetime.fromisoformat(task['due_date']).date()
-                    completed_date = datetime.fromisoformat(task['completed_at']).date()
-
-                    if due_date == completed_date:
-                        patterns['last_minute_completions'] += 1
-                except (ValueError, TypeError):
-                    continue
+        # Overdue analysis (tasks without a valid due date compare as NaT and drop out)
+        overdue = ~completed & (due_day < pd.Timestamp(date.today()))
+        patterns['overdue_by_priority'].update(TaskStore.count_values(df.loc[overdue, 'priority']))
+        patterns['avoidance_categories'].update(TaskStore.count_values(df.loc[overdue, 'list_name']))
+
+        # Last minute completion analysis
+        last_minute = completed & (due_day == df['completed_ts'].dt.normalize())
+        patterns['last_minute_completions'] = int(last_minute.sum())
 
         return patterns
 
 
+@njit(cache=True)
+def _assemble_schedule(durations: np.ndarray, break_frequency: int, start_hour: float,
+                       available_hours: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Greedily fit tasks into the available hours, returning chosen indices and start times"""
+    indices = np.empty(len(durations), dtype=np.int64)
+    start_times = np.empty(len(durations), dtype=np.float64)
+    count = 0
+    current_time = start_hour
+    remaining_hours = available_hours
+
+    for i in range(len(durations)):
+        if remaining_hours <= 0:
+            break
+
+        if durations[i] <= remaining_hours:
+            indices[count] = i
+            start_times[count] = current_time
+            count += 1
+            current_time += durations[i]
+            remaining_hours -= durations[i]
+
+            # Add break if needed
+            if count % break_frequency == 0 and remaining_hours > 0.25:
+                current_time += 0.25  # 15-minute break
+                remaining_hours -= 0.25
+
+    return indices[:count], start_times[:count]
+
+
+# Compile (or load the cached compilation) at import so the first schedule render doesn't pay for it
+_assemble_schedule(np.ones(1), 1, 9.0, 1.0)
+
+# Scheduling score weights
+_SCHEDULING_PRIORITY_WEIGHTS = {'high': 10, 'medium': 6, 'low': 3, 'none': 1}
+_SCHEDULING_IMPORTANT_LISTS = frozenset({'Work', 'Health', 'Personal'})
+
+
 class SmartScheduler:
     """Intelligent task scheduling system"""
 
@@ -229,89 +276,80 @@ class SmartScheduler:
 
         # Score tasks for scheduling
         scored_tasks = []
+        today = date.today()
         for task in tasks:
             if task['status'] != 'pending':
                 continue
 
-            score = SmartScheduler._calculate_task_priority_score(task, preferences)
+            score = SmartScheduler._calculate_task_priority_score(task, preferences, today)
             scored_tasks.append((task, score))
 
         # Sort by score (highest first)
         scored_tasks.sort(key=lambda x: x[1], reverse=True)
 
-        # Create schedule
-        schedule = []
-        current_time = 9  # Start at 9 AM
-        remaining_hours = available_hours
-
-        for task, score in scored_tasks:
-            if remaining_hours <= 0:
-                break
-
-            # Estimate time needed
-            estimated_time = task.get('estimated_time', 120) / 60  # Convert to hours
-            if estimated_time == 0:
-                estimated_time = 1  # Default 1 hour
-
-            if estimated_time <= remaining_hours:
-                schedule_item = {
-                    'task': task,
-                    'scheduled_time': current_time,
-                    'duration': estimated_time,
-                    'priority_score': score,
-                    'suggested_focus_level': SmartScheduler._suggest_focus_level(task, current_time, preferences)
-                }
+        # Estimate time needed (in hours) for each task, in score order
+        durations = np.empty(len(scored_tasks))
+        for i, (task, _) in enumerate(scored_tasks):
+            estimated_minutes = task.get('estimated_time')
+            durations[i] = (120 if estimated_minutes is None else estimated_minutes) / 60
+        durations[durations == 0] = 1  # Default 1 hour
 
-                schedule.append(schedule_item)
-                current_time += estimated_time
-                remaining_hours -= estimated_time
+        # Create schedule starting at 9 AM
+        indices, start_times = _assemble_schedule(durations, int(preferences['break_frequency']),
+                                                  9.0, float(available_hours))
 
-                # Add break if needed
-                if (len(schedule) % preferences['break_frequency'] == 0 and
-                        remaining_hours > 0.25):
-                    current_time += 0.25  # 15-minute break
-                    remaining_hours -= 0.25
+        schedule = []
+        for i, start_time in zip(indices, start_times):
+            task, score = scored_tasks[i]
+            schedule.append({
+                'task': task,
+                'scheduled_time': float(start_time),
+                'duration': float(durations[i]),
+                'priority_score': score,
+                'suggested_focus_level': SmartScheduler._suggest_focus_level(task, float(start_time), preferences)
+            })
 
         return schedule
 
     @staticmethod
-    def _calculate_task_priority_score(task: Dict, preferences: Dict) -> float:
+    def _calculate_task_priority_score(task: Dict, preferences: Dict, today: Optional[date] = None) -> float:
         """Calculate priority score for task scheduling"""
+        return SmartScheduler._score_task_fields(task['priority'], task.get('due_date'), task['list_name'],
+                                                 task.get('created_at'), today or date.today())
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score_task_fields(priority: str, due_date: Optional[str], list_name: str,
+                           created_at: Optional[str], today: date) -> float:
+        """Score the scheduling-relevant task fields, memoized per day"""
         score = 0
 
         # Priority weight
-        priority_weights = {'high': 10, 'medium': 6, 'low': 3, 'none': 1}
-        score += priority_weights.get(task['priority'], 1)
+        score += _SCHEDULING_PRIORITY_WEIGHTS.get(priority, 1)
 
         # Deadline urgency
-        if task.get('due_date'):
-            try:
-                due_date = datetime.fromisoformat(task['due_date']).date()
-                days_until_due = (due_date - date.today()).days
-
-                if days_until_due <= 0:
-                    score += 20  # Overdue
-                elif days_until_due == 1:
-                    score += 15  # Due tomorrow
-                elif days_until_due <= 3:
-                    score += 10  # Due soon
-                elif days_until_due <= 7:
-                    score += 5  # Due this week
-            except (ValueError, TypeError):
-                pass
+        due_dt = parse_iso_datetime(due_date)
+        if due_dt:
+            days_until_due = (due_dt.date() - today).days
+
+            if days_until_due <= 0:
+                score += 20  # Overdue
+            elif days_until_due == 1:
+                score += 15  # Due tomorrow
+            elif days_until_due <= 3:
+                score += 10  # Due soon
+            elif days_until_due <= 7:
+                score += 5  # Due this week
 
         # List-based priority
-        important_lists = ['Work', 'Health', 'Personal']
-        if task['list_name'] in important_lists:
+        if list_name in _SCHEDULING_IMPORTANT_LISTS:
             score += 3
 
         # Task age (older tasks get slight priority)
-        try:
-            created_date = datetime.fromisoformat(task['created_at']).date()
-            days_old = (date.today() - created_date).days
+        created_dt = parse_iso_datetime(created_at)
+        if created_dt:
+            days_old = (today - created_dt.date()).days
             score += min(days_old * 0.1, 2)  # Max 2 points for age
-        except (ValueError, TypeError):
-            pass
 
         return score
 
@@ -353,7 +391,8 @@ class TimeBlockingManager:
             st.session_state.time_blocks = []
 
         existing_blocks = [tb for tb in st.session_state.time_blocks
-                           if datetime.fromisoformat(tb['date']).date() == date_selected]
+                           if parse_iso_datetime(tb.get('date')) and
+                           parse_iso_datetime(tb['date']).date() == date_selected]
 
         return existing_blocks
 
@@ -372,11 +411,10 @@ class TimeBlockingManager:
         if not relevant_tasks:
             return []
 
-        # Sort by priority and deadline
-        relevant_tasks.sort(key=lambda t: (
-            {'high': 0, 'medium': 1, 'low': 2, 'none': 3}.get(t['priority'], 3),
-            t.get('due_date', '9999-12-31')
-        ))
+        # Sort by priority (ordered categorical) and deadline; tasks without a due date go last
+        store = TaskStore.of(relevant_tasks)
+        order = store.frame.sort_values(['priority', 'due_ts'], kind='stable', na_position='last').index
+        relevant_tasks = [relevant_tasks[i] for i in order]
 
         suggestions = []
         current_time = datetime.combine(date_selected, work_start)
@@ -420,19 +458,22 @@ class ProductivityMetricsAnalyzer:
     """Advanced productivity metrics and analysis"""
 
     @staticmethod
-    def calculate_comprehensive_metrics(tasks: List[Dict], habits: List[Dict],
+    def calculate_comprehensive_metrics(tasks: Union[List[Dict], TaskStore], habits: List[Dict],
                                         time_period: int = 30) -> Dict:
         """Calculate comprehensive productivity metrics"""
         end_date = date.today()
         start_date = end_date - timedelta(days=time_period)
 
+        # Parse the task list once and share the period masks across all task analyses
+        df = TaskStore.of(tasks).frame
+        masks = ProductivityMetricsAnalyzer._build_period_masks(df, start_date, end_date)
+
         metrics = {
-            'task_metrics': ProductivityMetricsAnalyzer._analyze_task_metrics(tasks, start_date, end_date),
+            'task_metrics': ProductivityMetricsAnalyzer._analyze_task_metrics(df, masks, end_date),
             'habit_metrics': ProductivityMetricsAnalyzer._analyze_habit_metrics(habits, start_date, end_date),
-            'efficiency_metrics': ProductivityMetricsAnalyzer._analyze_efficiency_metrics(tasks, start_date, end_date),
-            'consistency_metrics': ProductivityMetricsAnalyzer._analyze_consistency_metrics(tasks, habits, start_date,
-                                                                                            end_date),
-            'growth_metrics': ProductivityMetricsAnalyzer._analyze_growth_metrics(tasks, habits, start_date, end_date)
+            'efficiency_metrics': ProductivityMetricsAnalyzer._analyze_efficiency_metrics(df, masks),
+            'consistency_metrics': ProductivityMetricsAnalyzer._analyze_consistency_metrics(df, start_date, end_date),
+            'growth_metrics': ProductivityMetricsAnalyzer._analyze_growth_metrics(df, masks)
         }
 
         # Calculate overall productivity score
@@ -441,44 +482,48 @@ class ProductivityMetricsAnalyzer:
         return metrics
 
     @staticmethod
-    def _analyze_task_metrics(tasks: List[Dict], start_date: date, end_date: date) -> Dict:
+    def get_cached_metrics(tasks: List[Dict], habits: List[Dict], time_period: int = 30) -> Dict:
+        """Get calculate_comprehensive_metrics, recomputed only when tasks, habits, period or day change"""
+        def build(task_list: List[Dict]) -> Dict:
+            return ProductivityMetricsAnalyzer.calculate_comprehensive_metrics(task_list, habits, time_period)
+
+        return get_cached_for_tasks('metrics_cache', tasks, build, max_entries=16,
+                                    extra_key=(get_habits_fingerprint(habits), time_period, date.today()))
+
+    @staticmethod
+    def _build_period_masks(df: pd.DataFrame, start_date: date, end_date: date) -> Dict[str, pd.Series]:
+        """Build boolean masks over the task frame for the analysis period"""
+        created_day = df['created_ts'].dt.normalize()
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        mid = pd.Timestamp(start_date + (end_date - start_date) / 2)
+
+        return {
+            'in_period': created_day.between(start, end),
+            'first_half': created_day.between(start, mid),
+            'second_half': created_day.between(mid, end),
+            'completed': df['status'] == 'completed'
+        }
+
+    @staticmethod
+    def _analyze_task_metrics(df: pd.DataFrame, masks: Dict[str, pd.Series], end_date: date) -> Dict:
         """Analyze task-specific metrics"""
-        period_tasks = [t for t in tasks if ProductivityMetricsAnalyzer._is_in_period(t, start_date, end_date)]
-        completed_tasks = [t for t in period_tasks if t['status'] == 'completed']
+        period_tasks = df[masks['in_period']]
+        completed = masks['completed'][masks['in_period']]
+        completed_count = int(completed.sum())
 
         metrics = {
             'total_tasks': len(period_tasks),
-            'completed_tasks': len(completed_tasks),
-            'completion_rate': len(completed_tasks) / max(1, len(period_tasks)) * 100,
-            'priority_breakdown': defaultdict(int),
-            'list_breakdown': defaultdict(int),
-            'overdue_tasks': 0,
+            'completed_tasks': completed_count,
+            'completion_rate': completed_count / max(1, len(period_tasks)) * 100,
+            'priority_breakdown': TaskStore.count_values(period_tasks['priority']),
+            'list_breakdown': TaskStore.count_values(period_tasks['list_name']),
+            'overdue_tasks': int(((period_tasks['due_ts'] < pd.Timestamp(end_date)) & ~completed).sum()),
             'average_completion_time': 0
         }
 
-        completion_times = []
-
-        for task in period_tasks:
-            metrics['priority_breakdown'][task['priority']] += 1
-            metrics['list_breakdown'][task['list_name']] += 1
-
-            # Check for overdue
-            if (task.get('due_date') and task['status'] != 'completed' and
-                    datetime.fromisoformat(task['due_date']).date() < end_date):
-                metrics['overdue_tasks'] += 1
-
-        for task in completed_tasks:
-            if task.get('completed_at') and task.get('created_at'):
-                try:
-                    completed_dt = datetime.fromisoformat(task['completed_at'])
-                    created_dt = datetime.fromisoformat(task['created_at'])
-                    completion_time = (completed_dt - created_dt).total_seconds() / 3600
-                    completion_times.append(completion_time)
-                except (ValueError, TypeError):
-                    continue
-
-        if completion_times:
-            metrics['average_completion_time'] = np.mean(completion_times)
+        completion_times = (period_tasks['completed_ts'] - period_tasks['created_ts'])[completed].dropna()
+        if not completion_times.empty:
+            metrics['average_completion_time'] = completion_times.dt.total_seconds().mean() / 3600
 
         return metrics
 
@@ -487,29 +532,28 @@ class ProductivityMetricsAnalyzer:
         """Analyze habit-specific metrics"""
         metrics = {
             'total_habits': len(habits),
-            'active_habits': len([h for h in habits if h.get('active', True)]),
+            'active_habits': 0,
             'completion_rates': {},
             'streak_analysis': {},
             'consistency_scores': {}
         }
 
+        period_start = np.datetime64(start_date, 'D')
+        period_end = np.datetime64(end_date, 'D')
+        total_days = (end_date - start_date).days + 1
+
         for habit in habits:
             if not habit.get('active', True):
                 continue
+            metrics['active_habits'] += 1
 
-            completion_dates = habit.get('completion_dates', [])
-            period_completions = []
-
-            for date_str in completion_dates:
-                try:
-                    completion_date = datetime.fromisoformat(date_str).date()
-                    if start_date <= completion_date <= end_date:
-                        period_completions.append(completion_date)
-                except (ValueError, TypeError):
-                    continue
+            # Parse completion dates into a day-resolution array; invalid entries are dropped
+            completion_dates = pd.to_datetime(pd.Series(habit.get('completion_dates', []), dtype=object),
+                                              errors='coerce', format='ISO8601')
+            days = completion_dates.dropna().to_numpy().astype('datetime64[D]')
+            period_completions = np.sort(days[(days >= period_start) & (days <= period_end)])
 
             # Calculate completion rate for period
-            total_days = (end_date - start_date).days + 1
             completion_rate = len(period_completions) / total_days * 100
             metrics['completion_rates'][habit['name']] = completion_rate
 
@@ -522,29 +566,20 @@ class ProductivityMetricsAnalyzer:
                 'streak_ratio': current_streak / max(1, best_streak)
             }
 
-            # Calculate consistency score
+            # Calculate consistency score from the gaps between completions
             if len(period_completions) > 1:
-                # Calculate gaps between completions
-                sorted_completions = sorted(period_completions)
-                gaps = []
-                for i in range(1, len(sorted_completions)):
-                    gap = (sorted_completions[i] - sorted_completions[i - 1]).days
-                    gaps.append(gap)
-
-                if gaps:
-                    avg_gap = np.mean(gaps)
-                    gap_variance = np.var(gaps)
-                    consistency_score = max(0, 100 - gap_variance * 10)  # Higher variance = lower consistency
-                    metrics['consistency_scores'][habit['name']] = consistency_score
+                gaps = np.diff(period_completions).astype(np.int64)
+                gap_variance = gaps.var()
+                consistency_score = max(0, 100 - gap_variance * 10)  # Higher variance = lower consistency
+                metrics['consistency_scores'][habit['name']] = consistency_score
 
         return metrics
 
     @staticmethod
-    def _analyze_efficiency_metrics(tasks: List[Dict], start_date: date, end_date: date) -> Dict:
+    def _analyze_efficiency_metrics(df: pd.DataFrame, masks: Dict[str, pd.Series]) -> Dict:
         """Analyze efficiency-related metrics"""
-        completed_tasks = [t for t in tasks
-                           if t['status'] == 'completed' and
-                           ProductivityMetricsAnalyzer._is_in_period(t, start_date, end_date)]
+        period_tasks = df[masks['in_period']]
+        completed_tasks = period_tasks[masks['completed'][masks['in_period']]]
 
         metrics = {
             'time_estimation_accuracy': 0,
@@ -554,51 +589,29 @@ class ProductivityMetricsAnalyzer:
         }
 
         # Time estimation accuracy
-        estimation_accuracies = []
-        for task in completed_tasks:
-            estimated = task.get('estimated_time')
-            actual = task.get('actual_time')
+        estimated = pd.to_numeric(completed_tasks['estimated_time'], errors='coerce')
+        actual = pd.to_numeric(completed_tasks['actual_time'], errors='coerce')
+        has_estimate = (estimated > 0) & (actual > 0)
 
-            if estimated and actual and estimated > 0:
-                accuracy = 1 - abs(estimated - actual) / estimated
-                estimation_accuracies.append(max(0, accuracy))
-
-        if estimation_accuracies:
-            metrics['time_estimation_accuracy'] = np.mean(estimation_accuracies) * 100
+        if has_estimate.any():
+            accuracy = (1 - (estimated - actual).abs() / estimated)[has_estimate].clip(lower=0)
+            metrics['time_estimation_accuracy'] = accuracy.mean() * 100
 
         # Priority efficiency (how well high-priority tasks are completed)
-        priority_counts = defaultdict(lambda: {'total': 0, 'completed': 0})
-
-        for task in tasks:
-            if ProductivityMetricsAnalyzer._is_in_period(task, start_date, end_date):
-                priority_counts[task['priority']]['total'] += 1
-                if task['status'] == 'completed':
-                    priority_counts[task['priority']]['completed'] += 1
-
-        for priority, counts in priority_counts.items():
-            if counts['total'] > 0:
-                efficiency = counts['completed'] / counts['total'] * 100
-                metrics['priority_efficiency'][priority] = efficiency
+        priority_rates = masks['completed'][masks['in_period']].groupby(period_tasks['priority'], observed=True).mean()
+        metrics['priority_efficiency'] = (priority_rates * 100).to_dict()
 
         return metrics
 
     @staticmethod
-    def _analyze_consistency_metrics(tasks: List[Dict], habits: List[Dict],
-                                     start_date: date, end_date: date) -> Dict:
+    def _analyze_consistency_metrics(df: pd.DataFrame, start_date: date, end_date: date) -> Dict:
         """Analyze consistency patterns"""
         # Daily task completion consistency
-        daily_completions = defaultdict(int)
+        completed_day = df.loc[df['status'] == 'completed', 'completed_ts'].dt.normalize()
+        completed_day = completed_day[completed_day.between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+        daily_completions = completed_day.value_counts()
 
-        for task in tasks:
-            if task['status'] == 'completed' and task.get('completed_at'):
-                try:
-                    completed_date = datetime.fromisoformat(task['completed_at']).date()
-                    if start_date <= completed_date <= end_date:
-                        daily_completions[completed_date] += 1
-                except (ValueError, TypeError):
-                    continue
-
-        completion_counts = list(daily_completions.values())
+        completion_counts = daily_completions.to_numpy()
         consistency_score = 0
 
         if len(completion_counts) > 1:
@@ -611,22 +624,16 @@ class ProductivityMetricsAnalyzer:
 
         return {
             'daily_task_consistency': consistency_score,
-            'average_daily_completions': np.mean(completion_counts) if completion_counts else 0,
-            'most_productive_day': max(daily_completions, key=daily_completions.get) if daily_completions else None
+            'average_daily_completions': np.mean(completion_counts) if len(completion_counts) else 0,
+            'most_productive_day': daily_completions.idxmax().date() if len(completion_counts) else None
         }
 
     @staticmethod
-    def _analyze_growth_metrics(tasks: List[Dict], habits: List[Dict],
-                                start_date: date, end_date: date) -> Dict:
+    def _analyze_growth_metrics(df: pd.DataFrame, masks: Dict[str, pd.Series]) -> Dict:
         """Analyze growth and improvement trends"""
         # Split period in half to compare
-        mid_date = start_date + (end_date - start_date) / 2
-
-        first_half_tasks = [t for t in tasks if ProductivityMetricsAnalyzer._is_in_period(t, start_date, mid_date)]
-        second_half_tasks = [t for t in tasks if ProductivityMetricsAnalyzer._is_in_period(t, mid_date, end_date)]
-
-        first_half_completed = len([t for t in first_half_tasks if t['status'] == 'completed'])
-        second_half_completed = len([t for t in second_half_tasks if t['status'] == 'completed'])
+        first_half_completed = int((masks['first_half'] & masks['completed']).sum())
+        second_half_completed = int((masks['second_half'] & masks['completed']).sum())
 
         # Calculate growth rate
         task_completion_growth = 0
@@ -650,7 +657,7 @@ class ProductivityMetricsAnalyzer:
         # Habit consistency (25% weight)
         habit_rates = metrics['habit_metrics'].get('completion_rates', {})
         if habit_rates:
-            avg_habit_rate = np.mean(list(habit_rates.values()))
+            avg_habit_rate = fmean(habit_rates.values())
             score_components.append(avg_habit_rate * 0.25)
 
         # Efficiency (25% weight)
@@ -664,17 +671,123 @@ class ProductivityMetricsAnalyzer:
         return sum(score_components)
 
     @staticmethod
-    def _is_in_period(task_or_habit: Dict, start_date: date, end_date: date) -> bool:
-        """Check if task/habit is within the specified period"""
-        created_at = task_or_habit.get('created_at')
-        if not created_at:
-            return False
+    def filter_period_tasks(tasks: Union[List[Dict], TaskStore], start_date: date, end_date: date) -> List[Dict]:
+        """Get the tasks created within the period, using the cached task frame"""
+        store = TaskStore.of(tasks)
+        created_day = store.frame['created_ts'].dt.normalize()
+        return store.rows(created_day.between(pd.Timestamp(start_date), pd.Timestamp(end_date)))
+
+
+# Importance signals used by the Eisenhower matrix scoring
+_IMPORTANT_TAGS = frozenset({'urgent', 'important', 'critical', 'key', 'milestone'})
+_IMPORTANT_LISTS = frozenset({'Work', 'Health', 'Finance'})
+_IMPORTANT_KEYWORD_RE = re.compile('meeting|deadline|review|presentation|doctor')
+
+
+def score_eisenhower_tasks(tasks: Union[List[Dict], TaskStore], today: date,
+                           use_weights: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Score urgency and importance for all tasks in one columnar pass"""
+    df = TaskStore.of(tasks).frame
+
+    # Urgency from days until due; tasks without a valid due date are not urgent
+    due_ts = df['due_ts'].dt.normalize()
+    days_until_due = (due_ts - pd.Timestamp(today)).dt.days.to_numpy()
+    urgency = np.select(
+        [days_until_due <= 0, days_until_due <= 1, days_until_due <= 3, days_until_due <= 7],
+        [1.0, 0.9, 0.7, 0.4],  # Overdue, due tomorrow, due soon, due this week
+        default=0.1  # Due later
+    )
+    urgency = np.where(due_ts.notna().to_numpy(), urgency, 0.0)
+
+    # Base importance on priority
+    priority_scores = {'high': 1.0, 'medium': 0.6, 'low': 0.3, 'none': 0.1}
+    importance = df['priority'].map(priority_scores).astype(float).fillna(0.1).to_numpy()
+
+    # Add AI-like weighting if enabled
+    if use_weights and len(df):
+        # One row per (task, tag) so the tag check runs as a single isin over all tags
+        tags = df['tags'].explode()
+        tag_match = tags.str.lower().isin(_IMPORTANT_TAGS).groupby(level=0).any().to_numpy()
+        list_match = df['list_name'].isin(_IMPORTANT_LISTS).to_numpy()
+        keyword_match = df['title'].str.lower().str.contains(_IMPORTANT_KEYWORD_RE).to_numpy()
+
+        importance = importance + 0.2 * tag_match + 0.1 * list_match + 0.1 * keyword_match
+
+    return urgency, importance
+
+
+# Quadrant names indexed by (is_urgent << 1) | is_important
+_EISENHOWER_QUADRANTS = ('not_urgent_not_important', 'not_urgent_important',
+                         'urgent_not_important', 'urgent_important')
+
+
+def bucket_eisenhower_tasks(tasks: List[Dict], today: date, use_weights: bool = True,
+                            show_completed: bool = True, list_filter: Tuple[str, ...] = ()) -> Dict:
+    """Filter and score tasks, then bucket them into quadrants sorted by combined score"""
+    def build(task_list: List[Dict]) -> Dict:
+        store = TaskStore.of(task_list)
+        df = store.frame
+
+        # Apply filters as one mask; scores are computed on the shared full-list frame and then sliced
+        keep = np.ones(len(df), dtype=bool)
+        if not show_completed:
+            keep &= (df['status'] != 'completed').to_numpy()
 
-        try:
-            created_date = datetime.fromisoformat(created_at).date()
-            return start_date <= created_date <= end_date
-        except (ValueError, TypeError):
-            return False
+        if list_filter:
+            keep &= df['list_name'].isin(list_filter).to_numpy()
+
+        task_list = store.rows(keep)
+        urgency, importance = score_eisenhower_tasks(store, today, use_weights)
+        urgency, importance = urgency[keep], importance[keep]
+        codes = ((urgency > 0.5).astype(np.int8) << 1) | (importance > 0.5)
+
+        # One stable sort by (quadrant, -combined score), then split into contiguous quadrant runs
+        order = np.lexsort((-(urgency + importance), codes))
+        bounds = np.cumsum(np.bincount(codes, minlength=len(_EISENHOWER_QUADRANTS)))[:-1]
+        quadrant_indices = dict(zip(_EISENHOWER_QUADRANTS, np.split(order, bounds)))
+
+        return {
+            'tasks': task_list,
+            'urgency': urgency,
+            'importance': importance,
+            'quadrants': quadrant_indices,
+            'quadrant_tasks': {name: [task_list[i] for i in indices] for name, indices in quadrant_indices.items()}
+        }
+
+    # Reruns with unchanged tasks and filters reuse the previous filtering and scoring
+    return get_cached_for_tasks('eisenhower_cache', tasks, build, max_entries=32,
+                                extra_key=(today, use_weights, show_completed, tuple(list_filter)))
+
+
+def count_smart_filters(tasks: List[Dict], filter_types: Tuple[str, ...], lists: Tuple[str, ...],
+                        today: date) -> Dict[str, int]:
+    """Count tasks per sidebar filter with column masks, matching get_tasks_by_filter"""
+    def build(task_list: List[Dict]) -> Dict[str, int]:
+        store = TaskStore.of(task_list)
+        df = store.frame
+        due_days = store.due_days(today)
+
+        masks = {
+            'today': due_days == 0,
+            'tomorrow': due_days == 1,
+            'this_week': due_days <= 7,
+            'overdue': (due_days < 0) & (df['status'] == TaskStatus.PENDING.value).to_numpy(),
+            'high_priority': df['priority'] == Priority.HIGH.value,
+            'completed': df['status'] == TaskStatus.COMPLETED.value,
+        }
+
+        counts = {}
+        for filter_type in filter_types:
+            if filter_type in masks:
+                counts[filter_type] = int(masks[filter_type].sum())
+            elif filter_type != 'all' and filter_type in lists:
+                counts[filter_type] = int((df['list_name'] == filter_type).sum())
+            else:
+                counts[filter_type] = len(df)
+        return counts
+
+    return get_cached_for_tasks('smart_filter_cache', tasks, build,
+                                extra_key=(tuple(filter_types), tuple(lists), today))
 
 
 def render_advanced_eisenhower_matrix():
@@ -698,124 +811,57 @@ def render_advanced_eisenhower_matrix():
     with col4:
         priority_weights = st.checkbox("Use AI priority weights", value=True)
 
+    # Nothing to place: skip the scoring, the four quadrants and the insights chart
     tasks = st.session_state.tasks
-
-    # Apply filters
-    if not show_completed:
-        tasks = [t for t in tasks if t['status'] != 'completed']
-
-    if list_filter:
-        tasks = [t for t in tasks if t['list_name'] in list_filter]
-
-    today = date.today()
-    cutoff_date = today + timedelta(days=time_horizon)
+    completed_count = len(get_tasks_by(tasks, 'status').get(TaskStatus.COMPLETED.value, []))
+    if len(tasks) == 0 or (not show_completed and completed_count == len(tasks)):
+        st.info("No active tasks to organize. Add some tasks to see them in the matrix.")
+        return
 
     # Enhanced categorization with AI-like priority weighting
-    quadrants = {
-        'urgent_important': [],  # Do First (Q1)
-        'not_urgent_important': [],  # Schedule (Q2)
-        'urgent_not_important': [],  # Delegate (Q3)
-        'not_urgent_not_important': []  # Eliminate (Q4)
-    }
-
-    for task in tasks:
-        # Determine urgency
-        is_urgent = False
-        urgency_score = 0
-
-        if task.get('due_date'):
-            try:
-                due_date = datetime.fromisoformat(task['due_date']).date()
-                days_until_due = (due_date - today).days
-
-                if days_until_due <= 0:
-                    urgency_score = 1.0  # Overdue
-                elif days_until_due <= 1:
-                    urgency_score = 0.9  # Due tomorrow
-                elif days_until_due <= 3:
-                    urgency_score = 0.7  # Due soon
-                elif days_until_due <= 7:
-                    urgency_score = 0.4  # Due this week
-                else:
-                    urgency_score = 0.1  # Due later
-
-                is_urgent = urgency_score > 0.5
-            except (ValueError, TypeError):
-                pass
-
-        # Determine importance
-        importance_score = 0
-
-        # Base importance on priority
-        priority_scores = {'high': 1.0, 'medium': 0.6, 'low': 0.3, 'none': 0.1}
-        importance_score += priority_scores.get(task['priority'], 0.1)
-
-        # Add AI-like weighting if enabled
-        if priority_weights:
-            # Tags influence importance
-            important_tags = ['urgent', 'important', 'critical', 'key', 'milestone']
-            task_tags = [tag.lower() for tag in task.get('tags', [])]
-            if any(tag in important_tags for tag in task_tags):
-                importance_score += 0.2
-
-            # List-based importance
-            important_lists = ['Work', 'Health', 'Finance']
-            if task['list_name'] in important_lists:
-                importance_score += 0.1
-
-            # Title keywords
-            important_keywords = ['meeting', 'deadline', 'review', 'presentation', 'doctor']
-            title_lower = task['title'].lower()
-            if any(keyword in title_lower for keyword in important_keywords):
-                importance_score += 0.1
-
-        is_important = importance_score > 0.5
-
-        # Categorize with scores for sorting
-        task_with_scores = task.copy()
-        task_with_scores['urgency_score'] = urgency_score
-        task_with_scores['importance_score'] = importance_score
-
-        if is_urgent and is_important:
-            quadrants['urgent_important'].append(task_with_scores)
-        elif not is_urgent and is_important:
-            quadrants['not_urgent_important'].append(task_with_scores)
-        elif is_urgent and not is_important:
-            quadrants['urgent_not_important'].append(task_with_scores)
-        else:
-            quadrants['not_urgent_not_important'].append(task_with_scores)
+    buckets = bucket_eisenhower_tasks(tasks, date.today(), priority_weights,
+                                      show_completed, tuple(list_filter))
+    urgency_scores, importance_scores = buckets['urgency'], buckets['importance']
 
-    # Sort quadrants by scores
-    for quadrant in quadrants.values():
-        quadrant.sort(key=lambda x: (x['urgency_score'] + x['importance_score']), reverse=True)
+    # Quadrants are sorted by combined score (highest first); scores stay in parallel arrays
+    quadrants = buckets['quadrant_tasks']
+    quadrant_scores = {name: (urgency_scores[indices], importance_scores[indices])
+                       for name, indices in buckets['quadrants'].items()}
 
     # Render matrix
     col1, col2 = st.columns(2)
 
     with col1:
         render_matrix_quadrant("🔴 Q1: Do First", "Urgent & Important",
-                               quadrants['urgent_important'], "danger")
+                               quadrants['urgent_important'], "danger", quadrant_scores['urgent_important'])
 
     with col2:
         render_matrix_quadrant("🟡 Q2: Schedule", "Not Urgent & Important",
-                               quadrants['not_urgent_important'], "warning")
+                               quadrants['not_urgent_important'], "warning",
+                               quadrant_scores['not_urgent_important'])
 
     col3, col4 = st.columns(2)
 
     with col3:
         render_matrix_quadrant("🟠 Q3: Delegate", "Urgent & Not Important",
-                               quadrants['urgent_not_important'], "info")
+                               quadrants['urgent_not_important'], "info",
+                               quadrant_scores['urgent_not_important'])
 
     with col4:
         render_matrix_quadrant("🟢 Q4: Eliminate", "Not Urgent & Not Important",
-                               quadrants['not_urgent_not_important'], "success")
+                               quadrants['not_urgent_not_important'], "success",
+                               quadrant_scores['not_urgent_not_important'])
 
     # Action recommendations
     render_matrix_insights(quadrants)
 
 
-def render_matrix_quadrant(title: str, description: str, tasks: List[Dict], color_type: str):
+@fragment
+def render_matrix_quadrant(title: str, description: str, tasks: List[Dict], color_type: str,
+                           scores: Tuple[np.ndarray, np.ndarray]):
     """Render individual matrix quadrant with enhanced features"""
+    urgency_scores, importance_scores = scores
+
     with st.container():
         st.markdown(f"#### {title}")
         st.markdown(f"*{description}*")
@@ -826,84 +872,90 @@ def render_matrix_quadrant(title: str, description: str, tasks: List[Dict], colo
 
         st.markdown(f"**{len(tasks)} tasks**")
 
-        # Show top tasks with action buttons
-        for i, task in enumerate(tasks[:5]):  # Show first 5
-            with st.expander(f"{task['title'][:40]}{'...' if len(task['title']) > 40 else ''}",
-                             expanded=i == 0):
-
-                col1, col2, col3 = st.columns([3, 1, 1])
-
-                with col1:
-                    st.write(f"**Priority:** {task['priority'].title()}")
-                    if task.get('due_date'):
-                        st.write(f"**Due:** {format_date_display(task['due_date'])}")
-                    st.write(f"**List:** {task['list_name']}")
-
-                    if task.get('description'):
-                        st.write(f"**Description:** {task['description'][:100]}...")
+        # One virtualized table for the whole quadrant instead of an expander per task
+        table = pd.DataFrame({
+            'Done': False,
+            'Edit': False,
+            'Task': [task['title'] for task in tasks],
+            'Priority': [task['priority'].title() for task in tasks],
+            'Due': [format_date_display(task['due_date']) if task.get('due_date') else '' for task in tasks],
+            'List': [task['list_name'] for task in tasks],
+            'Urgency': urgency_scores,
+            'Importance': importance_scores
+        })
+
+        # The version suffix gives a fresh editor (no stale checkboxes) after each action
+        version = st.session_state.get('matrix_editor_version', 0)
+        edited = st.data_editor(
+            table,
+            key=f"matrix_editor_{color_type}_{version}",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['Task', 'Priority', 'Due', 'List', 'Urgency', 'Importance'],
+            column_config={
+                'Done': st.column_config.CheckboxColumn("✅", help="Complete task"),
+                'Edit': st.column_config.CheckboxColumn("📝", help="Edit task"),
+                'Urgency': st.column_config.NumberColumn(format="%.1f"),
+                'Importance': st.column_config.NumberColumn(format="%.1f")
+            }
+        )
 
-                    # Show AI scores
-                    st.write(f"**Urgency Score:** {task['urgency_score']:.1f}")
-                    st.write(f"**Importance Score:** {task['importance_score']:.1f}")
+        done_rows = np.flatnonzero(edited['Done'].to_numpy())
+        edit_rows = np.flatnonzero(edited['Edit'].to_numpy())
+        if len(done_rows) or len(edit_rows):
+            if len(done_rows):
+                complete_tasks(tasks[i]['id'] for i in done_rows)
+            if len(edit_rows):
+                st.session_state.editing_task = tasks[edit_rows[0]]['id']
 
-                with col2:
-                    if st.button("✅ Complete", key=f"complete_matrix_{task['id']}"):
-                        complete_task(task['id'])
-                        st.success("Task completed!")
-                        st.rerun()
+            st.session_state.matrix_editor_version = version + 1
+            st.rerun()
 
-                with col3:
-                    if st.button("📝 Edit", key=f"edit_matrix_{task['id']}"):
-                        st.session_state.editing_task = task['id']
-                        st.rerun()
 
-        if len(tasks) > 5:
-            st.markdown(f"... and {len(tasks) - 5} more tasks")
+# Distribution rules per quadrant (Q1-Q4): fire when the share is above (or below) the limit
+_MATRIX_RULE_LIMITS = np.array([40, 20, 30, 25])
+_MATRIX_RULE_ABOVE = np.array([True, False, True, True])
+_MATRIX_RULE_MESSAGES = (
+    "🚨 Too many urgent tasks! Focus on prevention and planning.",
+    "📅 Invest more time in important, non-urgent activities for long-term success.",
+    "🤝 Consider delegating or automating urgent but less important tasks.",
+    "🗑️ Review and eliminate low-value activities to free up time."
+)
 
 
 def render_matrix_insights(quadrants: Dict):
     """Render insights and recommendations based on matrix analysis"""
+    px = load_plotly().px
     st.markdown("### 🧠 Matrix Insights & Recommendations")
 
-    total_tasks = sum(len(quadrant) for quadrant in quadrants.values())
+    counts = np.array([len(quadrants[name]) for name in ('urgent_important', 'not_urgent_important',
+                                                         'urgent_not_important', 'not_urgent_not_important')])
+    total_tasks = counts.sum()
     if total_tasks == 0:
         return
 
     # Calculate distribution
-    q1_pct = len(quadrants['urgent_important']) / total_tasks * 100
-    q2_pct = len(quadrants['not_urgent_important']) / total_tasks * 100
-    q3_pct = len(quadrants['urgent_not_important']) / total_tasks * 100
-    q4_pct = len(quadrants['not_urgent_not_important']) / total_tasks * 100
+    pcts = counts / total_tasks * 100
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### 📊 Task Distribution")
 
-        # Create pie chart
-        fig = px.pie(
-            values=[q1_pct, q2_pct, q3_pct, q4_pct],
+        # Create pie chart, rebuilt only when the distribution changes
+        fig = get_cached('figure_cache', ('matrix_pie', *counts.tolist()), lambda: px.pie(
+            values=counts,
             names=['Q1: Do First', 'Q2: Schedule', 'Q3: Delegate', 'Q4: Eliminate'],
             color_discrete_sequence=['#FF6B6B', '#FFD93D', '#6BCF7F', '#4D96FF']
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        ), max_entries=32)
+        st.plotly_chart(fig, use_container_width=True, key="matrix_distribution_chart")
 
     with col2:
         st.markdown("#### 🎯 Recommendations")
 
-        recommendations = []
-
-        if q1_pct > 40:
-            recommendations.append("🚨 Too many urgent tasks! Focus on prevention and planning.")
-
-        if q2_pct < 20:
-            recommendations.append("📅 Invest more time in important, non-urgent activities for long-term success.")
-
-        if q3_pct > 30:
-            recommendations.append("🤝 Consider delegating or automating urgent but less important tasks.")
-
-        if q4_pct > 25:
-            recommendations.append("🗑️ Review and eliminate low-value activities to free up time.")
+        # Evaluate every quadrant rule at once against the distribution
+        fired = np.where(_MATRIX_RULE_ABOVE, pcts > _MATRIX_RULE_LIMITS, pcts < _MATRIX_RULE_LIMITS)
+        recommendations = [message for message, hit in zip(_MATRIX_RULE_MESSAGES, fired) if hit]
 
         if not recommendations:
             recommendations.append("✅ Great balance! Your task distribution looks healthy.")
@@ -912,7 +964,7 @@ def render_matrix_insights(quadrants: Dict):
             st.write(f"• {rec}")
 
         # Action buttons
-        if q1_pct > 30:
+        if pcts[0] > 30:
             if st.button("🎯 Start Focus Session", type="primary"):
                 st.session_state.current_view = "pomodoro"
                 st.rerun()
@@ -940,8 +992,7 @@ def render_smart_scheduling():
         include_completed = st.checkbox("Include completed tasks in analysis", value=False)
 
     # Get pending tasks
-    pending_tasks = [t for t in st.session_state.tasks
-                     if t['status'] == 'pending']
+    pending_tasks = get_tasks_by(st.session_state.tasks, 'status').get('pending', [])
 
     if not pending_tasks:
         st.info("No pending tasks to schedule!")
@@ -970,38 +1021,41 @@ def render_smart_scheduling():
             st.warning("Could not generate schedule. Try adjusting your parameters.")
 
 
-def render_schedule_visualization(schedule: List[Dict]):
-    """Render schedule as visual timeline"""
-    st.markdown("#### 📅 Your Optimized Schedule")
-
+def _build_schedule_figure(schedule: List[Dict]) -> 'go.Figure':
+    """Build the Gantt-like schedule chart"""
+    go = load_plotly().go
     # Create Gantt-like chart
     fig = go.Figure()
 
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
 
-    for i, item in enumerate(schedule):
-        task = item['task']
+    # Create time labels for every block
+    durations = [item['duration'] for item in schedule]
+    start_strs, end_strs = [], []
+    for item in schedule:
         start_time = item['scheduled_time']
-        duration = item['duration']
-
-        # Create time labels
-        start_str = f"{int(start_time):02d}:{int((start_time % 1) * 60):02d}"
-        end_str = f"{int(start_time + duration):02d}:{int(((start_time + duration) % 1) * 60):02d}"
-
-        fig.add_trace(go.Bar(
-            name=task['title'][:30],
-            x=[duration],
-            y=[i],
-            orientation='h',
-            marker_color=colors[i % len(colors)],
-            text=f"{start_str}-{end_str}",
-            textposition='middle center',
-            hovertemplate=f"<b>{task['title']}</b><br>" +
-                          f"Time: {start_str} - {end_str}<br>" +
-                          f"Duration: {duration:.1f}h<br>" +
-                          f"Priority: {task['priority'].title()}<br>" +
-                          f"Focus Level: {item['suggested_focus_level'].title()}<extra></extra>"
-        ))
+        end_time = start_time + item['duration']
+        start_strs.append(format_hour(start_time))
+        end_strs.append(format_hour(end_time))
+
+    # One bar trace for the whole schedule, with per-bar colors, labels and hover data
+    fig.add_trace(go.Bar(
+        x=durations,
+        y=list(range(len(schedule))),
+        orientation='h',
+        marker_color=[colors[i % len(colors)] for i in range(len(schedule))],
+        text=[f"{start_str}-{end_str}" for start_str, end_str in zip(start_strs, end_strs)],
+        textposition='inside',
+        insidetextanchor='middle',
+        customdata=[[item['task']['title'], f"{start_str} - {end_str}", item['task']['priority'].title(),
+                     item['suggested_focus_level'].title()]
+                    for item, start_str, end_str in zip(schedule, start_strs, end_strs)],
+        hovertemplate="<b>%{customdata[0]}</b><br>" +
+                      "Time: %{customdata[1]}<br>" +
+                      "Duration: %{x:.1f}h<br>" +
+                      "Priority: %{customdata[2]}<br>" +
+                      "Focus Level: %{customdata[3]}<extra></extra>"
+    ))
 
     fig.update_layout(
         title="Daily Schedule Timeline",
@@ -1014,59 +1068,76 @@ def render_schedule_visualization(schedule: List[Dict]):
                    ticktext=[item['task']['title'][:30] for item in schedule])
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_schedule_timeline(schedule: List[Dict]):
-    """Render detailed schedule timeline"""
-    st.markdown("#### ⏰ Detailed Timeline")
+def render_schedule_visualization(schedule: List[Dict]):
+    """Render schedule as visual timeline"""
+    st.markdown("#### 📅 Your Optimized Schedule")
 
-    for i, item in enumerate(schedule):
-        task = item['task']
-        start_time = item['scheduled_time']
-        duration = item['duration']
-        focus_level = item['suggested_focus_level']
-
-        # Time formatting
-        start_str = f"{int(start_time):02d}:{int((start_time % 1) * 60):02d}"
-        end_str = f"{int(start_time + duration):02d}:{int(((start_time + duration) % 1) * 60):02d}"
-
-        # Focus level styling
-        focus_colors = {
-            'high': '🔴',
-            'medium': '🟡',
-            'low': '🟢'
-        }
+    # Reuse the figure across reruns until the schedule changes
+    schedule_key = tuple((item['task']['id'], item['task']['title'], item['task']['priority'],
+                          item['scheduled_time'], item['duration'], item['suggested_focus_level'])
+                         for item in schedule)
+    fig = get_cached('figure_cache', ('schedule', schedule_key),
+                     lambda: _build_schedule_figure(schedule), max_entries=32)
+    st.plotly_chart(fig, use_container_width=True, key="schedule_chart")
 
-        with st.container():
-            col1, col2, col3, col4 = st.columns([2, 3, 2, 1])
 
-            with col1:
-                st.markdown(f"**⏰ {start_str} - {end_str}**")
-                st.markdown(f"*{duration:.1f}h duration*")
+# Focus level styling
+_FOCUS_LEVEL_EMOJI = {
+    'high': '🔴',
+    'medium': '🟡',
+    'low': '🟢'
+}
 
-            with col2:
-                st.markdown(f"**📋 {task['title']}**")
-                st.markdown(f"📁 {task['list_name']} | 🎯 {task['priority'].title()}")
 
-            with col3:
-                st.markdown(f"**Focus Level**")
-                st.markdown(f"{focus_colors.get(focus_level, '⚪')} {focus_level.title()}")
+@fragment
+def render_schedule_timeline(schedule: List[Dict]):
+    """Render detailed schedule timeline"""
+    st.markdown("#### ⏰ Detailed Timeline")
 
-            with col4:
-                if st.button("▶️ Start", key=f"start_scheduled_{i}"):
-                    # Start Pomodoro for this task
-                    st.session_state.pomodoro_state = {
-                        'active': True,
-                        'start_time': time_module.time(),
-                        'duration': min(25, int(duration * 60)),  # Max 25 min Pomodoro
-                        'current_type': 'work',
-                        'current_task': task['title']
-                    }
-                    st.session_state.current_view = "pomodoro"
-                    st.rerun()
+    # One editable table for the whole timeline; the Start column replaces a button per row
+    table = pd.DataFrame({
+        'Start': False,
+        'Time': [f"{format_hour(item['scheduled_time'])} - "
+                 f"{format_hour(item['scheduled_time'] + item['duration'])}" for item in schedule],
+        'Task': [item['task']['title'] for item in schedule],
+        'List': [item['task']['list_name'] for item in schedule],
+        'Priority': [item['task']['priority'].title() for item in schedule],
+        'Duration (h)': [item['duration'] for item in schedule],
+        'Focus Level': [f"{_FOCUS_LEVEL_EMOJI.get(item['suggested_focus_level'], '⚪')} "
+                        f"{item['suggested_focus_level'].title()}" for item in schedule]
+    })
+
+    version = st.session_state.get('timeline_editor_version', 0)
+    edited = st.data_editor(
+        table,
+        key=f"timeline_editor_{version}",
+        hide_index=True,
+        use_container_width=True,
+        disabled=['Time', 'Task', 'List', 'Priority', 'Duration (h)', 'Focus Level'],
+        column_config={
+            'Start': st.column_config.CheckboxColumn("▶️", help="Start a Pomodoro for this task"),
+            'Duration (h)': st.column_config.NumberColumn(format="%.1f")
+        }
+    )
 
-            st.divider()
+    started = np.flatnonzero(edited['Start'].to_numpy())
+    if len(started):
+        item = schedule[started[0]]
+
+        # Start Pomodoro for this task
+        st.session_state.pomodoro_state = {
+            'active': True,
+            'start_time': time_module.time(),
+            'duration': min(25, int(item['duration'] * 60)),  # Max 25 min Pomodoro
+            'current_type': 'work',
+            'current_task': item['task']['title']
+        }
+        st.session_state.current_view = "pomodoro"
+        st.session_state.timeline_editor_version = version + 1
+        st.rerun()
 
 
 def render_time_blocking_interface():
@@ -1088,8 +1159,8 @@ def render_time_blocking_interface():
 
     # Get tasks for selected date
     date_str = selected_date.isoformat()
-    relevant_tasks = [t for t in st.session_state.tasks
-                      if (t.get('due_date') == date_str or t['status'] == 'pending')]
+    store = TaskStore.of(st.session_state.tasks)
+    relevant_tasks = store.rows((store.frame['due_date'] == date_str) | (store.frame['status'] == 'pending'))
 
     if not relevant_tasks:
         st.info(f"No tasks found for {selected_date.strftime('%B %d, %Y')}")
@@ -1132,9 +1203,9 @@ def render_time_block_suggestions(suggestions: List[Dict]):
             col1, col2, col3, col4 = st.columns([2, 3, 2, 1])
 
             with col1:
-                start_time = datetime.strptime(block['start_time'], '%H:%M:%S').time()
-                end_time = datetime.strptime(block['end_time'], '%H:%M:%S').time()
-                st.markdown(f"**⏰ {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}**")
+                start_str = format_clock_time(block['start_time'])
+                end_str = format_clock_time(block['end_time'])
+                st.markdown(f"**⏰ {start_str} - {end_str}**")
 
             with col2:
                 st.markdown(f"**📋 {block['title']}**")
@@ -1175,9 +1246,9 @@ def render_existing_time_blocks(blocks: List[Dict]):
             col1, col2, col3 = st.columns([2, 4, 1])
 
             with col1:
-                start_time = datetime.strptime(block['start_time'], '%H:%M:%S').time()
-                end_time = datetime.strptime(block['end_time'], '%H:%M:%S').time()
-                st.markdown(f"**⏰ {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}**")
+                start_str = format_clock_time(block['start_time'])
+                end_str = format_clock_time(block['end_time'])
+                st.markdown(f"**⏰ {start_str} - {end_str}**")
 
             with col2:
                 st.markdown(f"**📋 {block['title']}**")
@@ -1215,9 +1286,7 @@ def render_comprehensive_analytics():
     habits = st.session_state.habits
 
     with st.spinner("Analyzing your productivity data..."):
-        metrics = ProductivityMetricsAnalyzer.calculate_comprehensive_metrics(
-            tasks, habits, time_period
-        )
+        metrics = ProductivityMetricsAnalyzer.get_cached_metrics(tasks, habits, time_period)
 
     # Overall score
     overall_score = metrics.get('overall_score', 0)
@@ -1234,24 +1303,31 @@ def render_comprehensive_analytics():
     col3.metric("Completed Tasks", task_metrics.get('completed_tasks', 0))
     col4.metric("Avg. Completion Time", f"{task_metrics.get('average_completion_time', 0):.1f}h")
 
-    # Detailed metrics tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📋 Task Analysis", "🎯 Habit Analysis", "⚡ Efficiency", "📈 Growth"])
+    # Detailed metrics sections; st.tabs would run every section's charts, so only the selected one is built
+    section = st.radio("Section", ["📋 Task Analysis", "🎯 Habit Analysis", "⚡ Efficiency", "📈 Growth"],
+                       horizontal=True, label_visibility="collapsed", key="analytics_section")
 
-    with tab1:
+    if section == "📋 Task Analysis":
         render_task_analytics(task_metrics)
-
-    with tab2:
+    elif section == "🎯 Habit Analysis":
         render_habit_analytics(metrics.get('habit_metrics', {}))
-
-    with tab3:
+    elif section == "⚡ Efficiency":
         render_efficiency_analytics(metrics.get('efficiency_metrics', {}))
-
-    with tab4:
+    else:
         render_growth_analytics(metrics.get('growth_metrics', {}))
 
 
+_COMPLETION_RATE_TIERS = np.array([60, 80])
+_COMPLETION_RATE_INSIGHTS = (
+    "⚠️ Low completion rate. Consider reviewing your task management strategy.",
+    "👍 Good completion rate, but there's room for improvement.",
+    "🌟 Excellent completion rate! You're staying on top of your tasks."
+)
+
+
 def render_task_analytics(task_metrics: Dict):
     """Render detailed task analytics"""
+    px = load_plotly().px
     col1, col2 = st.columns(2)
 
     with col1:
@@ -1259,7 +1335,7 @@ def render_task_analytics(task_metrics: Dict):
         priority_data = task_metrics.get('priority_breakdown', {})
 
         if priority_data:
-            fig = px.bar(
+            fig = get_cached('figure_cache', ('priority_bar', tuple(priority_data.items())), lambda: px.bar(
                 x=list(priority_data.keys()),
                 y=list(priority_data.values()),
                 title="Tasks by Priority",
@@ -1270,8 +1346,8 @@ def render_task_analytics(task_metrics: Dict):
                     'low': '#4ECDC4',
                     'none': '#95A5A6'
                 }
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            ), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="analytics_priority_chart")
         else:
             st.info("No priority data available")
 
@@ -1280,28 +1356,23 @@ def render_task_analytics(task_metrics: Dict):
         list_data = task_metrics.get('list_breakdown', {})
 
         if list_data:
-            fig = px.pie(
+            fig = get_cached('figure_cache', ('list_pie', tuple(list_data.items())), lambda: px.pie(
                 values=list(list_data.values()),
                 names=list(list_data.keys()),
                 title="Tasks by List"
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            ), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="analytics_list_chart")
         else:
             st.info("No list data available")
 
     # Key insights
     st.markdown("#### 💡 Key Insights")
 
-    insights = []
     completion_rate = task_metrics.get('completion_rate', 0)
     overdue_tasks = task_metrics.get('overdue_tasks', 0)
 
-    if completion_rate >= 80:
-        insights.append("🌟 Excellent completion rate! You're staying on top of your tasks.")
-    elif completion_rate >= 60:
-        insights.append("👍 Good completion rate, but there's room for improvement.")
-    else:
-        insights.append("⚠️ Low completion rate. Consider reviewing your task management strategy.")
+    # Completion tier by threshold lookup: below 60 low, below 80 good, otherwise excellent
+    insights = [_COMPLETION_RATE_INSIGHTS[np.searchsorted(_COMPLETION_RATE_TIERS, completion_rate, side='right')]]
 
     if overdue_tasks > 0:
         insights.append(f"📅 You have {overdue_tasks} overdue tasks. Consider prioritizing these.")
@@ -1314,6 +1385,7 @@ def render_task_analytics(task_metrics: Dict):
 
 def render_habit_analytics(habit_metrics: Dict):
     """Render detailed habit analytics"""
+    px = load_plotly().px
     completion_rates = habit_metrics.get('completion_rates', {})
     streak_analysis = habit_metrics.get('streak_analysis', {})
 
@@ -1327,36 +1399,30 @@ def render_habit_analytics(habit_metrics: Dict):
         st.markdown("#### 📊 Completion Rates")
 
         if completion_rates:
-            fig = px.bar(
+            fig = get_cached('figure_cache', ('habit_rates_bar', tuple(completion_rates.items())), lambda: px.bar(
                 x=list(completion_rates.keys()),
                 y=list(completion_rates.values()),
                 title="Habit Completion Rates (%)",
                 color=list(completion_rates.values()),
                 color_continuous_scale='RdYlGn'
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
+            ).update_layout(xaxis_tickangle=-45), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="habit_rates_chart")
 
     with col2:
         st.markdown("#### 🔥 Streak Analysis")
 
         if streak_analysis:
-            streak_data = []
-            for habit, data in streak_analysis.items():
-                streak_data.append({
-                    'Habit': habit,
-                    'Current Streak': data['current'],
-                    'Best Streak': data['best']
-                })
-
-            df = pd.DataFrame(streak_data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe({
+                'Habit': list(streak_analysis.keys()),
+                'Current Streak': [data['current'] for data in streak_analysis.values()],
+                'Best Streak': [data['best'] for data in streak_analysis.values()]
+            }, use_container_width=True)
 
     # Habit recommendations
     st.markdown("#### 🎯 Habit Recommendations")
 
     recommendations = []
-    avg_completion = np.mean(list(completion_rates.values())) if completion_rates else 0
+    avg_completion = fmean(completion_rates.values()) if completion_rates else 0
 
     if avg_completion >= 80:
         recommendations.append("🌟 Outstanding habit consistency! Consider adding new challenging habits.")
@@ -1377,49 +1443,58 @@ def render_habit_analytics(habit_metrics: Dict):
         st.write(f"• {rec}")
 
 
+def _build_estimation_gauge(accuracy: float):
+    """Build the time estimation accuracy gauge"""
+    go = load_plotly().go
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=accuracy,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Estimation Accuracy (%)"},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 50], 'color': "lightgray"},
+                {'range': [50, 80], 'color': "yellow"},
+                {'range': [80, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+
 def render_efficiency_analytics(efficiency_metrics: Dict):
     """Render efficiency analytics"""
+    px = load_plotly().px
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### ⏱️ Time Estimation Accuracy")
         accuracy = efficiency_metrics.get('time_estimation_accuracy', 0)
 
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=accuracy,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Estimation Accuracy (%)"},
-            gauge={
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 50], 'color': "lightgray"},
-                    {'range': [50, 80], 'color': "yellow"},
-                    {'range': [80, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        st.plotly_chart(fig, use_container_width=True)
+        fig = get_cached('figure_cache', ('estimation_gauge', accuracy),
+                         lambda: _build_estimation_gauge(accuracy), max_entries=32)
+        st.plotly_chart(fig, use_container_width=True, key="estimation_gauge_chart")
 
     with col2:
         st.markdown("#### 🎯 Priority Efficiency")
         priority_efficiency = efficiency_metrics.get('priority_efficiency', {})
 
         if priority_efficiency:
-            fig = px.bar(
-                x=list(priority_efficiency.keys()),
-                y=list(priority_efficiency.values()),
-                title="Completion Rate by Priority (%)",
-                color=list(priority_efficiency.values()),
-                color_continuous_scale='RdYlGn'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            fig = get_cached('figure_cache', ('priority_efficiency_bar', tuple(priority_efficiency.items())),
+                             lambda: px.bar(
+                                 x=list(priority_efficiency.keys()),
+                                 y=list(priority_efficiency.values()),
+                                 title="Completion Rate by Priority (%)",
+                                 color=list(priority_efficiency.values()),
+                                 color_continuous_scale='RdYlGn'
+                             ), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="priority_efficiency_chart")
         else:
             st.info("No priority efficiency data available")
 
@@ -1446,6 +1521,19 @@ def render_efficiency_analytics(efficiency_metrics: Dict):
         st.write(f"• {insight}")
 
 
+def _build_growth_figure(growth_rate: float):
+    """Build the start-to-current growth trajectory line"""
+    px = load_plotly().px
+    fig = px.line(
+        x=['Start', 'Current'],
+        y=[0, growth_rate],
+        title="Growth Trajectory",
+        markers=True
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+    return fig
+
+
 def render_growth_analytics(growth_metrics: Dict):
     """Render growth and trend analytics"""
     growth_rate = growth_metrics.get('task_completion_growth', 0)
@@ -1463,15 +1551,9 @@ def render_growth_analytics(growth_metrics: Dict):
 
         # Trend visualization
         if growth_rate != 0:
-            trend_data = [0, growth_rate]
-            fig = px.line(
-                x=['Start', 'Current'],
-                y=trend_data,
-                title="Growth Trajectory",
-                markers=True
-            )
-            fig.add_hline(y=0, line_dash="dash", line_color="gray")
-            st.plotly_chart(fig, use_container_width=True)
+            fig = get_cached('figure_cache', ('growth_trajectory', growth_rate),
+                             lambda: _build_growth_figure(growth_rate), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="growth_trajectory_chart")
 
     with col2:
         st.markdown("#### 🎯 Future Projections")
@@ -1533,15 +1615,16 @@ def generate_smart_insights(tasks: List[Dict], habits: List[Dict]) -> List[str]:
 
     # Task insights
     if tasks:
-        overdue_count = len([t for t in tasks
-                             if t.get('due_date') and t['status'] != 'completed' and
-                             datetime.fromisoformat(t['due_date']).date() < date.today()])
+        # Due dates come pre-parsed from the shared task frame (also used by the matrix scoring)
+        df = TaskStore.of(tasks).frame
+        is_overdue = (df['due_ts'].dt.normalize() < pd.Timestamp(date.today())) & (df['status'] != 'completed')
+        overdue_count = int(is_overdue.sum())
+        high_priority = int(((df['priority'] == 'high') & (df['status'] == 'pending')).sum())
 
         if overdue_count > 0:
             insights.append(f"🚨 You have {overdue_count} overdue tasks. Consider using the Focus Mode to catch up.")
 
         # Priority distribution
-        high_priority = len([t for t in tasks if t['priority'] == 'high' and t['status'] == 'pending'])
         if high_priority > 5:
             insights.append(
                 f"⚡ You have {high_priority} high-priority tasks. Consider breaking some into smaller tasks.")
@@ -1549,8 +1632,8 @@ def generate_smart_insights(tasks: List[Dict], habits: List[Dict]) -> List[str]:
     # Habit insights
     if habits:
         today_str = date.today().isoformat()
-        completed_today = len([h for h in habits if today_str in h.get('completion_dates', [])])
-        total_active = len([h for h in habits if h.get('active', True)])
+        completed_today = sum(1 for h in habits if today_str in get_habit_date_set(h))
+        total_active = sum(1 for h in habits if h.get('active', True))
 
         if total_active > 0:
             completion_rate = completed_today / total_active * 100
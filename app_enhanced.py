@@ -2,9 +2,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta, date
 import time
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
 import uuid
 from utils import *
@@ -21,7 +18,7 @@ st.set_page_config(
 )
 
 # Enhanced CSS for modern UI
-st.markdown("""
+_APP_CSS = """
 <style>
     /* Main theme variables */
     :root {
@@ -357,7 +354,9 @@ st.markdown("""
     .status-completed { background: var(--success-color); }
     .status-cancelled { background: #6b7280; }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Streamlit drops elements a rerun doesn't emit, so the styles are sent every run, minified once
+st.markdown(minify_css(_APP_CSS), unsafe_allow_html=True)
 
 # Initialize enhanced systems
 init_session_state()
@@ -370,6 +369,7 @@ if 'smart_data_manager' not in st.session_state:
 # Load saved data on startup
 if 'data_loaded' not in st.session_state:
     load_saved_data()
+    prime_task_timestamps(st.session_state.tasks)
     st.session_state.data_loaded = True
 
 # Auto-save with enhanced error handling
@@ -380,6 +380,30 @@ if 'last_auto_save' not in st.session_state:
 if (datetime.now() - st.session_state.last_auto_save).seconds > 30:
     auto_save_data()
 
+# Sidebar navigation and smart list schemas: (label, view or filter type)
+_NAV_OPTIONS = (
+    ("📝 Tasks", "tasks"),
+    ("📅 Calendar", "calendar"),
+    ("🎯 Habits", "habits"),
+    ("🍅 Pomodoro", "pomodoro"),
+    ("📊 Analytics", "analytics"),
+    ("🧠 Smart Features", "smart"),
+    ("🔔 Notifications", "notifications"),
+    ("⚙️ Settings", "settings")
+)
+
+_SMART_FILTERS = (
+    ("📋 All Tasks", "all"),
+    ("📅 Today", "today"),
+    ("📆 Tomorrow", "tomorrow"),
+    ("📋 This Week", "this_week"),
+    ("⚠️ Overdue", "overdue"),
+    ("⭐ High Priority", "high_priority"),
+    ("🔄 In Progress", "in_progress"),
+    ("✅ Completed", "completed")
+)
+_SMART_FILTER_TYPES = tuple(filter_type for _, filter_type in _SMART_FILTERS)
+
 # Enhanced sidebar with modern design
 with st.sidebar:
     # App header with gradient
@@ -458,18 +482,7 @@ with st.sidebar:
     # Enhanced navigation with notification badges
     notification_count = get_notification_badge_count()
 
-    nav_options = {
-        "📝 Tasks": "tasks",
-        "📅 Calendar": "calendar",
-        "🎯 Habits": "habits",
-        "🍅 Pomodoro": "pomodoro",
-        "📊 Analytics": "analytics",
-        "🧠 Smart Features": "smart",
-        "🔔 Notifications": "notifications",
-        "⚙️ Settings": "settings"
-    }
-
-    for label, view in nav_options.items():
+    for label, view in _NAV_OPTIONS:
         # Add notification badge for notifications view
         display_label = label
         if view == "notifications" and notification_count > 0:
@@ -485,19 +498,11 @@ with st.sidebar:
 
     # Enhanced Smart Lists with modern styling
     st.markdown("### 🧠 Smart Lists")
-    smart_filters = {
-        "📋 All Tasks": "all",
-        "📅 Today": "today",
-        "📆 Tomorrow": "tomorrow",
-        "📋 This Week": "this_week",
-        "⚠️ Overdue": "overdue",
-        "⭐ High Priority": "high_priority",
-        "🔄 In Progress": "in_progress",
-        "✅ Completed": "completed"
-    }
+    filter_counts = count_smart_filters(st.session_state.tasks, _SMART_FILTER_TYPES,
+                                        tuple(st.session_state.lists), date.today())
 
-    for label, filter_type in smart_filters.items():
-        task_count = len(get_tasks_by_filter(filter_type))
+    for label, filter_type in _SMART_FILTERS:
+        task_count = filter_counts[filter_type]
 
         # Modern list item with hover effects
         if st.button(f"{label} ({task_count})",
@@ -508,13 +513,13 @@ with st.sidebar:
             st.session_state.current_view = "tasks"
             st.rerun()
 
-    # Custom Lists with enhanced UI
+    # Custom Lists with enhanced UI; per-list counts come from the cached task stats
     st.markdown("### 📁 My Lists")
     for list_name in st.session_state.lists:
-        list_tasks = [t for t in st.session_state.tasks if t['list_name'] == list_name]
-        total_count = len(list_tasks)
-        pending_count = len([t for t in list_tasks if t['status'] == TaskStatus.PENDING.value])
-        completed_count = len([t for t in list_tasks if t['status'] == TaskStatus.COMPLETED.value])
+        list_stats = stats['list_stats'][list_name]
+        total_count = list_stats['total']
+        pending_count = list_stats['pending']
+        completed_count = list_stats['completed']
 
         if st.button(f"📋 {list_name} ({pending_count}/{total_count})",
                      use_container_width=True,
@@ -648,6 +653,10 @@ elif st.session_state.current_view == "settings":
 
 
 # Helper functions for enhanced views
+_TASK_PAGE_SIZE = 25
+
+
+@fragment
 def render_enhanced_task_list_view(search_query: str):
     """Enhanced task list view with modern UI"""
 
@@ -706,13 +715,7 @@ def render_enhanced_task_list_view(search_query: str):
         with col5:
             sort_reverse = st.checkbox("Reverse order", key="sort_reverse")
 
-    # Get and filter tasks with enhanced logic
-    if search_query:
-        tasks = search_tasks_advanced(search_query)
-    else:
-        tasks = get_tasks_by_filter(getattr(st.session_state, 'current_filter', 'all'))
-
-    # Apply additional filters
+    status = None
     if filter_status != "All":
         status_map = {
             "Pending": TaskStatus.PENDING.value,
@@ -720,8 +723,17 @@ def render_enhanced_task_list_view(search_query: str):
             "Completed": TaskStatus.COMPLETED.value,
             "Cancelled": TaskStatus.CANCELLED.value
         }
-        tasks = [t for t in tasks if t['status'] == status_map[filter_status]]
+        status = status_map[filter_status]
 
+    # Get and filter tasks with enhanced logic; search applies the status filter before matching
+    if search_query:
+        tasks = search_tasks(search_query, status=status)
+    else:
+        tasks = get_tasks_by_filter(getattr(st.session_state, 'current_filter', 'all'))
+        if status is not None:
+            tasks = [t for t in tasks if t['status'] == status]
+
+    # Apply additional filters
     if filter_list != "All":
         tasks = [t for t in tasks if t['list_name'] == filter_list]
 
@@ -731,6 +743,13 @@ def render_enhanced_task_list_view(search_query: str):
     # Enhanced sorting
     tasks = sort_tasks(tasks, sort_by.lower().replace(" ", "_"), sort_reverse)
 
+    # A new search, filter or sort order starts again from the first page
+    page_view = (search_query, filter_status, filter_list, filter_priority,
+                 getattr(st.session_state, 'current_filter', 'all'), sort_by, sort_reverse)
+    if st.session_state.get('task_page_view') != page_view:
+        st.session_state.task_page_view = page_view
+        st.session_state.task_page = 0
+
     # Display enhanced task list
     st.markdown(f"### 📋 Found {len(tasks)} tasks")
 
@@ -743,12 +762,37 @@ def render_enhanced_task_list_view(search_query: str):
         </div>
         """, unsafe_allow_html=True)
     else:
-        for task in tasks:
+        # Only the current page of cards is rendered; the page is clamped when filters shrink the list
+        page_count = (len(tasks) - 1) // _TASK_PAGE_SIZE + 1
+        page = min(st.session_state.get('task_page', 0), page_count - 1)
+
+        for task in tasks[page * _TASK_PAGE_SIZE:(page + 1) * _TASK_PAGE_SIZE]:
             render_enhanced_task_card(task)
 
+        if page_count > 1:
+            col1, col2, col3 = st.columns([1, 2, 1])
 
-def render_enhanced_task_card(task: Dict):
-    """Render enhanced task card with modern design"""
+            with col1:
+                if st.button("⬅️ Previous", key="task_page_prev", disabled=page == 0, use_container_width=True):
+                    st.session_state.task_page = page - 1
+                    st.rerun()
+
+            with col2:
+                st.markdown(f"<div style='text-align: center; color: #6b7280;'>Page {page + 1} of {page_count}</div>",
+                            unsafe_allow_html=True)
+
+            with col3:
+                if st.button("Next ➡️", key="task_page_next", disabled=page == page_count - 1,
+                             use_container_width=True):
+                    st.session_state.task_page = page + 1
+                    st.rerun()
+
+
+_PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🔵", "none": "⚪"}
+
+
+def _build_task_card_html(task: Dict) -> str:
+    """Build the HTML body of a task card"""
 
     # Determine card styling
     priority_class = f"priority-{task['priority']}"
@@ -791,6 +835,40 @@ def render_enhanced_task_card(task: Dict):
             act_hours = task['actual_time'] / 60
             time_info += f" | Act: {act_hours:.1f}h"
 
+    # Enhanced task display
+    title_style = "text-decoration: line-through; opacity: 0.7;" if task['status'] == TaskStatus.COMPLETED.value else ""
+
+    return f"""
+            <div class="task-card {priority_class} {status_class}">
+                <div style="display: flex; align-items: center; margin-bottom: 8px;">
+                    <span class="status-indicator status-{task['status'].replace('_', '-')}"></span>
+                    <h4 style="margin: 0; {title_style}">{task['title']}</h4>
+                </div>
+
+                {f'<p style="color: #6b7280; margin: 8px 0; {title_style}">{task["description"]}</p>' if task.get('description') else ''}
+
+                <div style="display: flex; align-items: center; gap: 16px; font-size: 13px; color: #6b7280;">
+                    <span>📋 {task['list_name']}</span>
+                    <span>📅 {due_date_display}</span>
+                    <span>🎯 {task['priority'].title()}</span>
+                    {f'<span>{time_info}</span>' if time_info else ''}
+                </div>
+
+                {progress_html}
+                {tags_html}
+            </div>
+            """
+
+
+def render_enhanced_task_card(task: Dict):
+    """Render enhanced task card with modern design"""
+
+    # The card markup only changes with the fields it shows, so it is rebuilt only when one of them does
+    card_key = (task['id'], task['title'], task.get('description'), task['status'], task['priority'],
+                task['list_name'], task.get('due_date'), task.get('estimated_time'), task.get('actual_time'),
+                repr(task.get('tags')), repr(task.get('subtasks')), date.today())
+    card_html = get_cached('task_card_html_cache', card_key, lambda: _build_task_card_html(task), max_entries=1024)
+
     with st.container():
         col1, col2, col3, col4 = st.columns([0.5, 6, 1.5, 1])
 
@@ -814,29 +892,7 @@ def render_enhanced_task_card(task: Dict):
 
         with col2:
             # Enhanced task display
-            title_style = "text-decoration: line-through; opacity: 0.7;" if task[
-                                                                                'status'] == TaskStatus.COMPLETED.value else ""
-
-            st.markdown(f"""
-            <div class="task-card {priority_class} {status_class}">
-                <div style="display: flex; align-items: center; margin-bottom: 8px;">
-                    <span class="status-indicator status-{task['status'].replace('_', '-')}"></span>
-                    <h4 style="margin: 0; {title_style}">{task['title']}</h4>
-                </div>
-
-                {f'<p style="color: #6b7280; margin: 8px 0; {title_style}">{task["description"]}</p>' if task.get('description') else ''}
-
-                <div style="display: flex; align-items: center; gap: 16px; font-size: 13px; color: #6b7280;">
-                    <span>📋 {task['list_name']}</span>
-                    <span>📅 {due_date_display}</span>
-                    <span>🎯 {task['priority'].title()}</span>
-                    {f'<span>{time_info}</span>' if time_info else ''}
-                </div>
-
-                {progress_html}
-                {tags_html}
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(card_html, unsafe_allow_html=True)
 
         with col3:
             # Action buttons with modern styling
@@ -860,14 +916,14 @@ def render_enhanced_task_card(task: Dict):
 
         with col4:
             # Priority indicator and quick actions
-            priority_colors = {"high": "🔴", "medium": "🟡", "low": "🔵", "none": "⚪"}
-            st.markdown(f"**{priority_colors.get(task['priority'], '⚪')}**")
+            st.markdown(f"**{_PRIORITY_EMOJI.get(task['priority'], '⚪')}**")
 
             if task['status'] == TaskStatus.PENDING.value:
                 if st.button("🍅", key=f"pomodoro_{task['id']}", help="Start focus session"):
                     start_pomodoro_for_task(task)
 
 
+@fragment
 def render_enhanced_calendar_view():
     """Enhanced calendar view with modern design"""
 
@@ -891,6 +947,7 @@ def render_enhanced_calendar_view():
         render_daily_calendar_view(current_date, show_completed, color_by)
 
 
+@fragment
 def render_enhanced_habits_view():
     """Enhanced habits view with modern design"""
 
@@ -1004,10 +1061,7 @@ def render_enhanced_habit_card(habit: Dict):
                       delta=f"+{current_streak - best_streak}" if current_streak > best_streak else None)
 
             # Calculate completion rate for last 30 days
-            thirty_days_ago = date.today() - timedelta(days=30)
-            recent_completions = [d for d in completion_dates
-                                  if datetime.fromisoformat(d).date() >= thirty_days_ago]
-            completion_rate = len(recent_completions) / 30 * 100
+            completion_rate = get_habit_completion_counts(completion_dates)['recent'] / 30 * 100
 
             st.metric("30-Day Rate", f"{completion_rate:.0f}%")
 
@@ -1022,34 +1076,31 @@ def render_enhanced_habit_card(habit: Dict):
 
 def render_habit_tracker_grid(completion_dates: List[str]):
     """Render habit tracker grid for last 30 days"""
+    today = date.today()
+    completed = set(completion_dates)  # O(1) membership per day instead of a list scan
 
     # Generate last 30 days
-    grid_html = '<div class="habit-tracker-grid">'
-
+    cells = []
     for i in range(29, -1, -1):  # Last 30 days
-        check_date = date.today() - timedelta(days=i)
-        date_str = check_date.isoformat()
+        check_date = today - timedelta(days=i)
 
-        if date_str in completion_dates:
+        if check_date.isoformat() in completed:
             css_class = "completed"
             title = f"Completed on {check_date.strftime('%m/%d')}"
-        elif check_date < date.today():
+        elif check_date < today:
             css_class = "missed"
             title = f"Missed on {check_date.strftime('%m/%d')}"
         else:
             css_class = "pending"
             title = f"Today ({check_date.strftime('%m/%d')})"
 
-        grid_html += f'<div class="habit-day {css_class}" title="{title}"></div>'
+        cells.append(f'<div class="habit-day {css_class}" title="{title}"></div>')
 
-    grid_html += '</div>'
-
-    st.markdown(grid_html, unsafe_allow_html=True)
+    st.markdown(f'<div class="habit-tracker-grid">{"".join(cells)}</div>', unsafe_allow_html=True)
 
 
 def render_enhanced_pomodoro_timer():
     """Enhanced Pomodoro timer with modern design"""
-
     col1, col2 = st.columns([1, 1])
 
     with col1:
@@ -1087,58 +1138,8 @@ def render_enhanced_pomodoro_timer():
 
         # Enhanced timer display
         if st.session_state.pomodoro_state.get('active', False):
-            elapsed = time.time() - st.session_state.pomodoro_state['start_time']
-            duration_seconds = st.session_state.pomodoro_state['duration'] * 60
-            remaining = max(0, duration_seconds - elapsed)
-
-            minutes = int(remaining // 60)
-            seconds = int(remaining % 60)
-            progress = 1 - (remaining / duration_seconds)
-
-            # Enhanced timer display with animations
-            timer_class = "active" if remaining > 0 else ""
-            current_type = st.session_state.pomodoro_state['current_type']
-
-            st.markdown(f"""
-            <div class="pomodoro-timer {timer_class}">
-                {minutes:02d}:{seconds:02d}
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Enhanced progress visualization
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=progress * 100,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': f"{current_type.title()} Session"},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "#667eea"},
-                    'steps': [{'range': [0, 100], 'color': "lightgray"}],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
-                }
-            ))
-            fig.update_layout(height=200)
-            st.plotly_chart(fig, use_container_width=True)
-
-            if remaining <= 0:
-                handle_pomodoro_completion(current_type, sessions_completed)
-
-            # Enhanced controls
-            col_a, col_b = st.columns(2)
-            with col_a:
-                if st.button("⏸️ Pause", type="secondary", use_container_width=True):
-                    st.session_state.pomodoro_state['active'] = False
-                    st.rerun()
-            with col_b:
-                if st.button("⏹️ Stop", type="secondary", use_container_width=True):
-                    st.session_state.pomodoro_state['active'] = False
-                    st.session_state.pomodoro_state['start_time'] = None
-                    st.rerun()
+            # The countdown refreshes itself every second as a fragment
+            render_pomodoro_countdown()
 
         else:
             # Timer ready state with enhanced UI
@@ -1167,6 +1168,66 @@ def render_enhanced_pomodoro_timer():
         render_current_task_focus()
 
 
+@timed_fragment(run_every=1)
+def render_pomodoro_countdown():
+    """Countdown, progress gauge and controls for the active Pomodoro session"""
+    go = load_plotly().go
+    sessions_completed = st.session_state.pomodoro_state.get('sessions_completed', 0)
+
+    elapsed = time.time() - st.session_state.pomodoro_state['start_time']
+    duration_seconds = st.session_state.pomodoro_state['duration'] * 60
+    remaining = max(0, duration_seconds - elapsed)
+
+    minutes = int(remaining // 60)
+    seconds = int(remaining % 60)
+    progress = 1 - (remaining / duration_seconds)
+
+    # Enhanced timer display with animations
+    timer_class = "active" if remaining > 0 else ""
+    current_type = st.session_state.pomodoro_state['current_type']
+
+    st.markdown(f"""
+    <div class="pomodoro-timer {timer_class}">
+        {minutes:02d}:{seconds:02d}
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Enhanced progress visualization
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=progress * 100,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': f"{current_type.title()} Session"},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#667eea"},
+            'steps': [{'range': [0, 100], 'color': "lightgray"}],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    fig.update_layout(height=200)
+    st.plotly_chart(fig, use_container_width=True, key="pomodoro_progress_chart")
+
+    if remaining <= 0:
+        handle_pomodoro_completion(current_type, sessions_completed)
+
+    # Enhanced controls
+    col_a, col_b = st.columns(2)
+    with col_a:
+        if st.button("⏸️ Pause", type="secondary", use_container_width=True):
+            st.session_state.pomodoro_state['active'] = False
+            st.rerun()
+    with col_b:
+        if st.button("⏹️ Stop", type="secondary", use_container_width=True):
+            st.session_state.pomodoro_state['active'] = False
+            st.session_state.pomodoro_state['start_time'] = None
+            st.rerun()
+
+
 def render_enhanced_settings():
     """Enhanced settings interface"""
 
@@ -1231,8 +1292,8 @@ def start_pomodoro_session(session_type: str, duration: int, sessions_completed:
     st.rerun()
 
 
-# Auto-refresh for active timer
-if (st.session_state.current_view == "pomodoro" and
+# Auto-refresh for active timer, on Streamlit versions where the countdown cannot refresh itself
+if (not FRAGMENTS_SUPPORTED and st.session_state.current_view == "pomodoro" and
         st.session_state.pomodoro_state.get('active', False)):
     time.sleep(1)
     st.rerun()
\ No newline at end of file
@@ -10,10 +10,37 @@ import time
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Union, Tuple, Any
 from pathlib import Path
+from collections import deque
 from dataclasses import dataclass, asdict
 from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 
+try:
+    import orjson  # Optional C JSON serializer, much faster than stdlib json
+except ImportError:
+    orjson = None
+
+
+def _dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, through orjson when it is installed"""
+    if orjson is not None:
+        # Dates and datetimes go through default=str, as with stdlib json
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse JSON bytes, through orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Files written by stdlib json may hold NaN/Infinity, which only json accepts
+    return json.loads(data)
+
 
 @dataclass
 class BackupMetadata:
@@ -151,7 +178,7 @@ class SmartDataManager:
         self._stop_backup = threading.Event()
 
         # Data change tracking
-        self.change_log = []
+        self.change_log = deque(maxlen=1000)  # Only the last 1000 entries are kept
         self.last_save_time = datetime.now()
 
         # Performance metrics
@@ -393,7 +420,7 @@ class SmartDataManager:
                 # Update performance metrics
                 save_time = time.time() - start_time
                 self.performance_metrics['save_times'].append(save_time)
-                self.performance_metrics['data_sizes'].append(len(json.dumps(data)))
+                self.performance_metrics['data_sizes'].append(len(_dumps_json(data)))
 
                 # Keep only last 100 metrics
                 for metric_list in self.performance_metrics.values():
@@ -474,8 +501,8 @@ class SmartDataManager:
                 serializable_data.append(serializable_item)
 
             # Write to temporary file first
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump({
+            with open(temp_path, 'wb') as f:
+                f.write(_dumps_json({
                     'metadata': {
                         'timestamp': datetime.now().isoformat(),
                         'version': '2.0',
@@ -483,7 +510,7 @@ class SmartDataManager:
                         'checksum': self.calculate_checksum(serializable_data)
                     },
                     'data': serializable_data
-                }, f, indent=2, default=str, ensure_ascii=False)
+                }, indent=True))
 
             # Atomic move
             temp_path.replace(file_path)
@@ -503,8 +530,8 @@ class SmartDataManager:
             return []
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_content = json.load(f)
+            with open(file_path, 'rb') as f:
+                file_content = _loads_json(f.read())
 
             # Handle both old and new format
             if isinstance(file_content, list):
@@ -733,7 +760,7 @@ class SmartDataManager:
                 # Add change log if available
                 if self.change_log:
                     zipf.writestr('change_log.json',
-                                  json.dumps(self.change_log, indent=2, default=str))
+                                  json.dumps(list(self.change_log), indent=2, default=str))
 
             # Store backup metadata
             backup_metadata = BackupMetadata(
@@ -878,11 +905,8 @@ class SmartDataManager:
         if not backup_files:
             return None
 
-        # Sort by modification time
-        backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        latest_backup = backup_files[0]
-
-        return datetime.fromtimestamp(latest_backup.stat().st_mtime)
+        # Only the newest modification time is needed, so no sort
+        return datetime.fromtimestamp(max(f.stat().st_mtime for f in backup_files))
 
     def cleanup_old_backups(self, keep_count: int = 20, keep_days: int = 30):
         """Enhanced backup cleanup with retention policies"""
@@ -1139,10 +1163,6 @@ class SmartDataManager:
 
         self.change_log.append(change_entry)
 
-        # Keep only last 1000 entries
-        if len(self.change_log) > 1000:
-            self.change_log = self.change_log[-1000:]
-
     def _recover_from_backup(self, data_type: str) -> List[Dict]:
         """Attempt to recover data from most recent backup"""
         try:
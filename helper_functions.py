@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
 import json
 import calendar
+from dataclasses import asdict
 from typing import Dict, List, Optional, Tuple
 from utils import *
 from advanced_features import *
@@ -69,12 +68,12 @@ def render_advanced_search_interface():
             # Results summary
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Total Results", len(results))
-            col2.metric("High Priority", len([t for t in results if t['priority'] == 'high']))
-            col3.metric("Due Soon", len([t for t in results if t.get('due_date') and
-                                         datetime.fromisoformat(t['due_date']).date() <= date.today() + timedelta(
-                days=3)]))
-            col4.metric("Overdue", len([t for t in results if t.get('due_date') and
-                                        datetime.fromisoformat(t['due_date']).date() < date.today()]))
+            results_df = TaskStore.of(results).frame
+            due_day = results_df['due_ts'].dt.normalize()
+            today = pd.Timestamp(date.today())
+            col2.metric("High Priority", int((results_df['priority'] == 'high').sum()))
+            col3.metric("Due Soon", int((due_day <= today + pd.Timedelta(days=3)).sum()))
+            col4.metric("Overdue", int((due_day < today).sum()))
 
             # Display results
             for task in results:
@@ -83,6 +82,9 @@ def render_advanced_search_interface():
             st.info("No tasks found matching your search criteria.")
 
 
+_WEEKDAY_ABBREVIATIONS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
 def render_monthly_calendar_grid(current_date: date, show_completed: bool, color_by: str):
     """Render monthly calendar grid with tasks"""
 
@@ -99,33 +101,32 @@ def render_monthly_calendar_grid(current_date: date, show_completed: bool, color
     if not show_completed:
         task_filter.status = TaskStatus.PENDING.value
 
-    for task in get_tasks_by_filter(task_filter):
-        if task.get('due_date'):
-            try:
-                task_date = datetime.fromisoformat(task['due_date']).date()
-                if month_start <= task_date <= month_end:
-                    date_str = task_date.isoformat()
-                    if date_str not in month_tasks:
-                        month_tasks[date_str] = []
-                    month_tasks[date_str].append(task)
-            except (ValueError, TypeError):
-                continue
+    # Due dates come pre-parsed from the task frame; invalid or missing ones are NaT and drop out
+    store = TaskStore.of(get_tasks_by_filter(task_filter))
+    due_day = store.frame['due_ts'].dt.normalize()
+    in_month = due_day.between(pd.Timestamp(month_start), pd.Timestamp(month_end))
+
+    # Cell labels are truncated once for the month with vectorized string ops
+    titles = store.frame['title'][in_month].astype(str)
+    short_titles = titles.str.slice(0, 15).where(titles.str.len() <= 15, titles.str.slice(0, 15) + '...')
+    for task, short_title, date_str in zip(store.rows(in_month), short_titles,
+                                           due_day[in_month].dt.strftime('%Y-%m-%d')):
+        month_tasks.setdefault(date_str, []).append((task, short_title))
 
     # Calendar header
     st.markdown(f"### {calendar.month_name[current_date.month]} {current_date.year}")
 
-    # Days of week header
-    days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
     # Create calendar grid
     cal = calendar.monthcalendar(current_date.year, current_date.month)
 
     # Header row
     cols = st.columns(7)
-    for i, day in enumerate(days_of_week):
-        cols[i].markdown(f"**{day[:3]}**")
+    for i, day in enumerate(_WEEKDAY_ABBREVIATIONS):
+        cols[i].markdown(f"**{day}**")
 
     # Calendar rows
+    today = date.today()
     for week in cal:
         cols = st.columns(7)
         for i, day in enumerate(week):
@@ -134,7 +135,7 @@ def render_monthly_calendar_grid(current_date: date, show_completed: bool, color
             else:
                 day_date = date(current_date.year, current_date.month, day)
                 date_str = day_date.isoformat()
-                is_today = day_date == date.today()
+                is_today = day_date == today
 
                 with cols[i]:
                     # Day header with styling
@@ -143,11 +144,12 @@ def render_monthly_calendar_grid(current_date: date, show_completed: bool, color
                     else:
                         st.markdown(f"**{day}**")
 
-                    # Show tasks for this day
+                    # Show tasks for this day, collected into one markdown element per cell
                     if date_str in month_tasks:
                         tasks_today = month_tasks[date_str][:3]  # Show max 3 tasks
+                        chips = []
 
-                        for task in tasks_today:
+                        for task, short_title in tasks_today:
                             # Color coding based on selection
                             if color_by == "Priority":
                                 color = get_priority_color(task['priority'])
@@ -158,16 +160,14 @@ def render_monthly_calendar_grid(current_date: date, show_completed: bool, color
 
                             status_icon = "✅" if task['status'] == TaskStatus.COMPLETED.value else "⭕"
 
-                            st.markdown(f"""
-                            <div style="background: {color}; color: white; padding: 2px 4px; 
-                                      border-radius: 4px; margin: 2px 0; font-size: 10px;">
-                                {status_icon} {task['title'][:15]}{'...' if len(task['title']) > 15 else ''}
-                            </div>
-                            """, unsafe_allow_html=True)
+                            chips.append(f'<div style="background: {color}; color: white; padding: 2px 4px; '
+                                         f'border-radius: 4px; margin: 2px 0; font-size: 10px;">'
+                                         f'{status_icon} {short_title}</div>')
 
                         if len(month_tasks[date_str]) > 3:
-                            st.markdown(f"<small>+{len(month_tasks[date_str]) - 3} more</small>",
-                                        unsafe_allow_html=True)
+                            chips.append(f"<small>+{len(month_tasks[date_str]) - 3} more</small>")
+
+                        st.markdown("".join(chips), unsafe_allow_html=True)
 
 
 def render_task_details_modal(task: Dict):
@@ -235,7 +235,8 @@ def render_task_details_modal(task: Dict):
             st.markdown("#### 📝 Notes & History")
             for note in task['notes']:
                 if isinstance(note, dict):
-                    timestamp = datetime.fromisoformat(note['timestamp']).strftime('%m/%d %H:%M')
+                    noted_at = parse_iso_datetime(note['timestamp'])
+                    timestamp = noted_at.strftime('%m/%d %H:%M') if noted_at else note['timestamp']
                     note_type = note.get('type', 'note').title()
                     st.write(f"**{timestamp} - {note_type}:** {note.get('note', note.get('changes', 'N/A'))}")
 
@@ -264,8 +265,7 @@ def render_current_task_focus():
                 st.rerun()
     else:
         # Select task to focus on
-        pending_tasks = [t for t in st.session_state.tasks
-                         if t['status'] == TaskStatus.PENDING.value]
+        pending_tasks = get_tasks_by(st.session_state.tasks, 'status').get(TaskStatus.PENDING.value, [])
 
         if pending_tasks:
             task_options = ["No specific task"] + [f"{t['title']} ({t['list_name']})" for t in pending_tasks]
@@ -283,8 +283,25 @@ def render_current_task_focus():
             st.info("No pending tasks. Create some tasks to focus on!")
 
 
+def _build_completion_trend_figure(dates, completions) -> 'go.Figure':
+    """Build the daily completions line chart with its linear trend"""
+    px, go = load_plotly()
+    fig = px.line(x=dates, y=completions, title="Daily Task Completions",
+                  labels={'x': 'Date', 'y': 'Tasks Completed'})
+
+    # Add trend line
+    if len(completions) > 1:
+        z = np.polyfit(range(len(completions)), completions, 1)
+        trend_line = np.poly1d(z)(range(len(completions)))
+        fig.add_trace(go.Scatter(x=dates, y=trend_line, mode='lines',
+                                 name='Trend', line=dict(dash='dash')))
+
+    return fig
+
+
 def render_productivity_overview():
     """Render productivity overview dashboard"""
+    px = load_plotly().px
 
     # Time period selection
     col1, col2, col3 = st.columns(3)
@@ -304,9 +321,7 @@ def render_productivity_overview():
     start_date = end_date - timedelta(days=time_period)
 
     # Current period metrics
-    current_metrics = ProductivityMetricsAnalyzer.calculate_comprehensive_metrics(
-        tasks, habits, time_period
-    )
+    current_metrics = ProductivityMetricsAnalyzer.get_cached_metrics(tasks, habits, time_period)
 
     # Previous period metrics for comparison
     prev_metrics = None
@@ -314,10 +329,8 @@ def render_productivity_overview():
         prev_end_date = start_date
         prev_start_date = prev_end_date - timedelta(days=time_period)
         # Filter tasks for previous period
-        prev_tasks = [t for t in tasks if ProductivityMetricsAnalyzer._is_in_period(t, prev_start_date, prev_end_date)]
-        prev_metrics = ProductivityMetricsAnalyzer.calculate_comprehensive_metrics(
-            prev_tasks, habits, time_period
-        )
+        prev_tasks = ProductivityMetricsAnalyzer.filter_period_tasks(tasks, prev_start_date, prev_end_date)
+        prev_metrics = ProductivityMetricsAnalyzer.get_cached_metrics(prev_tasks, habits, time_period)
 
     # Main metrics display
     st.markdown("### 📊 Productivity Overview")
@@ -365,36 +378,20 @@ def render_productivity_overview():
         # Task completion trend
         st.markdown("#### 📈 Task Completion Trend")
 
-        # Generate daily completion data for the period
-        daily_completions = {}
-        for i in range(time_period):
-            check_date = start_date + timedelta(days=i)
-            daily_completions[check_date.isoformat()] = 0
-
-        for task in tasks:
-            if task['status'] == TaskStatus.COMPLETED.value and task.get('completed_at'):
-                try:
-                    completed_date = datetime.fromisoformat(task['completed_at']).date()
-                    if start_date <= completed_date <= end_date:
-                        daily_completions[completed_date.isoformat()] += 1
-                except (ValueError, TypeError):
-                    continue
+        # Generate daily completion data for the period, ending today
+        tasks_df = TaskStore.of(tasks).frame
+        completed = tasks_df[(tasks_df['status'] == TaskStatus.COMPLETED.value) & tasks_df['completed_ts'].notna()]
+        daily = completed.groupby(completed['completed_ts'].dt.floor('D')).size()
+        period_days = pd.date_range(end=pd.Timestamp(end_date), periods=time_period, freq='D')
+        daily_completions = daily.reindex(period_days, fill_value=0)
 
         # Create trend chart
-        dates = list(daily_completions.keys())
-        completions = list(daily_completions.values())
+        dates = daily_completions.index.strftime('%Y-%m-%d')
+        completions = daily_completions.to_numpy()
 
-        fig = px.line(x=dates, y=completions, title="Daily Task Completions",
-                      labels={'x': 'Date', 'y': 'Tasks Completed'})
-
-        # Add trend line
-        if len(completions) > 1:
-            z = np.polyfit(range(len(completions)), completions, 1)
-            trend_line = np.poly1d(z)(range(len(completions)))
-            fig.add_trace(go.Scatter(x=dates, y=trend_line, mode='lines',
-                                     name='Trend', line=dict(dash='dash')))
-
-        st.plotly_chart(fig, use_container_width=True)
+        fig = get_cached('figure_cache', ('completion_trend', end_date, tuple(completions.tolist())),
+                         lambda: _build_completion_trend_figure(dates, completions), max_entries=32)
+        st.plotly_chart(fig, use_container_width=True, key="completion_trend_chart")
 
     with col2:
         # Priority distribution
@@ -402,16 +399,18 @@ def render_productivity_overview():
 
         priority_data = task_metrics.get('priority_breakdown', {})
         if priority_data:
-            fig = px.pie(values=list(priority_data.values()),
-                         names=[p.title() for p in priority_data.keys()],
-                         title="Tasks by Priority",
-                         color_discrete_map={
-                             'High': '#FF6B6B',
-                             'Medium': '#FFD93D',
-                             'Low': '#4ECDC4',
-                             'None': '#95A5A6'
-                         })
-            st.plotly_chart(fig, use_container_width=True)
+            fig = get_cached('figure_cache', ('priority_pie', tuple(priority_data.items())), lambda: px.pie(
+                values=list(priority_data.values()),
+                names=[p.title() for p in priority_data.keys()],
+                title="Tasks by Priority",
+                color_discrete_map={
+                    'High': '#FF6B6B',
+                    'Medium': '#FFD93D',
+                    'Low': '#4ECDC4',
+                    'None': '#95A5A6'
+                }
+            ), max_entries=32)
+            st.plotly_chart(fig, use_container_width=True, key="overview_priority_chart")
         else:
             st.info("No priority data available")
 
@@ -487,7 +486,7 @@ def render_goal_tracking_interface():
                     deadline=deadline,
                     created_at=datetime.now()
                 )
-                st.session_state.productivity_goals.append(new_goal.__dict__)
+                st.session_state.productivity_goals.append(asdict(new_goal))
                 st.success("Goal created! 🎯")
                 st.rerun()
 
@@ -602,17 +601,10 @@ def calculate_goal_progress(goal: Dict) -> int:
     created_date = datetime.fromisoformat(goal['created_at']).date()
 
     if metric_type == "tasks_completed":
-        # Count completed tasks since goal creation
-        completed_count = 0
-        for task in st.session_state.tasks:
-            if task['status'] == TaskStatus.COMPLETED.value and task.get('completed_at'):
-                try:
-                    completed_date = datetime.fromisoformat(task['completed_at']).date()
-                    if completed_date >= created_date:
-                        completed_count += 1
-                except (ValueError, TypeError):
-                    continue
-        return completed_count
+        # Count completed tasks since goal creation; missing or invalid completion times are NaT and drop out
+        df = TaskStore.of(st.session_state.tasks).frame
+        since_created = df['completed_ts'].dt.normalize() >= pd.Timestamp(created_date)
+        return int(((df['status'] == TaskStatus.COMPLETED.value) & since_created).sum())
 
     elif metric_type == "habit_streaks":
         # Find the longest current streak
@@ -706,11 +698,7 @@ def calculate_consistency_achievements() -> List[Dict]:
 
         if len(completion_dates) >= 30:  # Need at least 30 days of data
             # Calculate 30-day consistency
-            last_30_days = date.today() - timedelta(days=30)
-            recent_completions = [d for d in completion_dates
-                                  if datetime.fromisoformat(d).date() >= last_30_days]
-
-            consistency_rate = len(recent_completions) / 30 * 100
+            consistency_rate = get_habit_completion_counts(completion_dates)['recent'] / 30 * 100
 
             if consistency_rate >= 90:
                 achievements.append({
@@ -735,7 +723,7 @@ def calculate_completion_achievements() -> List[Dict]:
     achievements = []
 
     for habit in st.session_state.habits:
-        total_completions = len(habit.get('completion_dates', []))
+        total_completions = get_habit_completion_counts(habit.get('completion_dates', []))['total']
 
         milestones = [
             (50, "Half Century", "⭐"),
@@ -772,14 +760,15 @@ def calculate_weekly_achievements() -> List[Dict]:
         perfect_weeks = 0
         current_week_count = 0
 
-        # Check each week in the last 12 weeks
-        for week_offset in range(12):
-            week_start = date.today() - timedelta(days=date.today().weekday() + (week_offset * 7))
-            week_days = [week_start + timedelta(days=i) for i in range(7)]
-
-            week_completions = sum(1 for day in week_days
-                                   if day.isoformat() in completion_dates)
+        # Sort the distinct ISO dates once and slice the last 12 weeks out of them by boundary
+        sorted_dates = np.unique(np.asarray(completion_dates, dtype=str))
+        current_week_start = date.today() - timedelta(days=date.today().weekday())
+        week_bounds = np.searchsorted(sorted_dates, [(current_week_start - timedelta(days=7 * week_offset)).isoformat()
+                                                     for week_offset in range(-1, 12)])
+        week_completion_counts = week_bounds[:-1] - week_bounds[1:]
 
+        # Check each week in the last 12 weeks
+        for week_completions in week_completion_counts:
             if week_completions == 7:
                 current_week_count += 1
             else:
@@ -856,7 +845,7 @@ def generate_comprehensive_insights() -> Dict[str, List[Dict]]:
 
     # Performance insights
     if tasks:
-        completion_rate = len([t for t in tasks if t['status'] == TaskStatus.COMPLETED.value]) / len(tasks) * 100
+        completion_rate = len(get_tasks_by(tasks, 'status').get(TaskStatus.COMPLETED.value, [])) / len(tasks) * 100
 
         if completion_rate > 80:
             insights["🎯 Performance Insights"].append({
@@ -886,9 +875,9 @@ def generate_comprehensive_insights() -> Dict[str, List[Dict]]:
             })
 
     # Optimization opportunities
-    overdue_count = len([t for t in tasks if t.get('due_date') and
-                         datetime.fromisoformat(t['due_date']).date() < date.today() and
-                         t['status'] == TaskStatus.PENDING.value])
+    tasks_df = TaskStore.of(tasks).frame
+    overdue_count = int(((tasks_df['due_ts'].dt.normalize() < pd.Timestamp(date.today())) &
+                         (tasks_df['status'] == TaskStatus.PENDING.value)).sum())
 
     if overdue_count > 0:
         insights["⚡ Optimization Opportunities"].append({
@@ -941,15 +930,18 @@ def analyze_recent_trends(tasks: List[Dict]) -> float:
     week2_completions = 0
 
     for task in tasks:
-        if task['status'] == TaskStatus.COMPLETED.value and task.get('completed_at'):
-            try:
-                completed_date = datetime.fromisoformat(task['completed_at']).date()
-                if week1_start <= completed_date <= week1_end:
-                    week1_completions += 1
-                elif week2_start <= completed_date <= week2_end:
-                    week2_completions += 1
-            except (ValueError, TypeError):
-                continue
+        if task['status'] != TaskStatus.COMPLETED.value:
+            continue
+
+        completed_dt = parse_iso_datetime(task.get('completed_at'))
+        if completed_dt is None:
+            continue
+
+        completed_date = completed_dt.date()
+        if week1_start <= completed_date <= week1_end:
+            week1_completions += 1
+        elif week2_start <= completed_date <= week2_end:
+            week2_completions += 1
 
     if week2_completions == 0:
         return 0
@@ -958,31 +950,33 @@ def analyze_recent_trends(tasks: List[Dict]) -> float:
 
 
 # Utility functions for colors and styling
+_LIST_COLORS = {
+    "Inbox": "#6B7280",
+    "Personal": "#10B981",
+    "Work": "#3B82F6",
+    "Shopping": "#F59E0B",
+    "Health": "#EF4444",
+    "Learning": "#8B5CF6"
+}
+
+_STATUS_COLORS = {
+    "pending": "#F59E0B",
+    "in_progress": "#3B82F6",
+    "completed": "#10B981",
+    "cancelled": "#6B7280"
+}
+
+
 def get_list_color(list_name: str) -> str:
     """Get color for a specific list"""
-    colors = {
-        "Inbox": "#6B7280",
-        "Personal": "#10B981",
-        "Work": "#3B82F6",
-        "Shopping": "#F59E0B",
-        "Health": "#EF4444",
-        "Learning": "#8B5CF6"
-    }
-
     # Generate a color for unlisted items
-    if list_name not in colors:
+    if list_name not in _LIST_COLORS:
         hash_val = hash(list_name) % 360
         return f"hsl({hash_val}, 70%, 50%)"
 
-    return colors[list_name]
+    return _LIST_COLORS[list_name]
 
 
 def get_status_color(status: str) -> str:
     """Get color for task status"""
-    colors = {
-        "pending": "#F59E0B",
-        "in_progress": "#3B82F6",
-        "completed": "#10B981",
-        "cancelled": "#6B7280"
-    }
-    return colors.get(status, "#6B7280")
\ No newline at end of file
+    return _STATUS_COLORS.get(status, "#6B7280")
\ No newline at end of file
@@ -5,6 +5,11 @@ import json
 from enum import Enum
 from dataclasses import dataclass, asdict
 import uuid
+from collections import Counter, deque
+
+
+# Priorities that count as important for deadline warnings
+_IMPORTANT_PRIORITIES = frozenset({'high', 'medium'})
 
 
 class NotificationType(Enum):
@@ -31,6 +36,16 @@ class NotificationPriority(Enum):
     CRITICAL = "critical"
 
 
+# Sort rank for unread notifications, most pressing first
+_NOTIFICATION_PRIORITY_ORDER = {
+    NotificationPriority.CRITICAL: 0,
+    NotificationPriority.URGENT: 1,
+    NotificationPriority.HIGH: 2,
+    NotificationPriority.MEDIUM: 3,
+    NotificationPriority.LOW: 4
+}
+
+
 class NotificationCategory(Enum):
     TASKS = "tasks"
     HABITS = "habits"
@@ -81,7 +96,7 @@ class SmartNotificationManager:
     def __init__(self):
         self.notifications = []
         self.notification_rules = []
-        self.notification_history = []
+        self.notification_history = deque(maxlen=1000)  # Only the last 1000 entries are kept
         self.user_preferences = self._load_preferences()
         self.load_notifications()
         self._register_default_rules()
@@ -305,9 +320,9 @@ class SmartNotificationManager:
         if not overdue_tasks:
             return
 
-        # Group by how overdue they are
-        critical_overdue = [t for t in overdue_tasks
-                            if (date.today() - datetime.fromisoformat(t['due_date']).date()).days > 7]
+        # Group by how overdue they are; ISO strings compare like the dates they encode
+        critical_cutoff = (date.today() - timedelta(days=7)).isoformat()
+        critical_overdue = [t for t in overdue_tasks if t['due_date'] < critical_cutoff]
 
         if critical_overdue:
             self.create_notification(
@@ -330,13 +345,15 @@ class SmartNotificationManager:
 
     def _create_deadline_warnings(self):
         """Create warnings for upcoming deadlines"""
-        upcoming_tasks = []
+        # Bucket pending important tasks by due date in one pass, then look up each horizon
+        important_by_due = {}
+        for t in st.session_state.get('tasks', []):
+            if t.get('status') == 'pending' and t.get('priority') in _IMPORTANT_PRIORITIES:
+                important_by_due.setdefault(t.get('due_date'), []).append(t)
+
         for days_ahead in [1, 3, 7]:  # Tomorrow, 3 days, 1 week
             target_date = (date.today() + timedelta(days=days_ahead)).isoformat()
-            tasks = [t for t in st.session_state.get('tasks', [])
-                     if t.get('due_date') == target_date
-                     and t.get('status') == 'pending'
-                     and t.get('priority') in ['high', 'medium']]
+            tasks = important_by_due.get(target_date, [])
 
             if tasks:
                 time_frame = "tomorrow" if days_ahead == 1 else f"in {days_ahead} days"
@@ -351,6 +368,8 @@ class SmartNotificationManager:
 
     def _create_habit_reminders(self):
         """Create smart habit reminders"""
+        from utils import get_habit_date_set
+
         today = date.today().isoformat()
         current_time = datetime.now().time()
 
@@ -359,7 +378,7 @@ class SmartNotificationManager:
                 continue
 
             # Skip if already completed today
-            if today in habit.get('completion_dates', []):
+            if today in get_habit_date_set(habit):
                 continue
 
             # Check if it's time for reminder
@@ -489,17 +508,19 @@ class SmartNotificationManager:
         """Check for upcoming deadlines in next 7 days"""
         week_ahead = (date.today() + timedelta(days=7)).isoformat()
         return any(t.get('due_date') and t.get('due_date') <= week_ahead
-                   and t.get('status') == 'pending' and t.get('priority') in ['high', 'medium']
+                   and t.get('status') == 'pending' and t.get('priority') in _IMPORTANT_PRIORITIES
                    for t in st.session_state.get('tasks', []))
 
     def _check_habit_reminders(self) -> bool:
         """Check if any habits need reminders"""
+        from utils import get_habit_date_set
+
         today = date.today().isoformat()
         current_time = datetime.now().time()
 
         for habit in st.session_state.get('habits', []):
             if (habit.get('active', True) and
-                    today not in habit.get('completion_dates', []) and
+                    today not in get_habit_date_set(habit) and
                     habit.get('reminder_time')):
                 try:
                     reminder_time = datetime.strptime(habit['reminder_time'], '%H:%M').time()
@@ -563,11 +584,12 @@ class SmartNotificationManager:
 
     def _is_duplicate_notification(self, title: str, notification_type: NotificationType, data: Dict) -> bool:
         """Check for duplicate notifications"""
+        day_ago = datetime.now() - timedelta(hours=24)
         similar_notifications = [n for n in self.notifications
                                  if n.type == notification_type
                                  and n.title == title
                                  and not n.dismissed
-                                 and (datetime.now() - n.created_at).hours < 24]
+                                 and n.created_at > day_ago]
 
         return len(similar_notifications) > 0
 
@@ -599,28 +621,20 @@ class SmartNotificationManager:
             'title': notification.title
         })
 
-        # Keep only last 1000 history entries
-        if len(self.notification_history) > 1000:
-            self.notification_history = self.notification_history[-1000:]
-
-    def get_unread_notifications(self) -> List[Notification]:
-        """Get all unread notifications, sorted by priority and time"""
+    def get_unread_notifications(self, sort: bool = True) -> List[Notification]:
+        """Get all unread notifications, sorted by priority and time unless sort is False"""
         unread = [n for n in self.notifications if not n.read and not n.dismissed]
 
         # Remove expired notifications
         current_time = datetime.now()
         unread = [n for n in unread if n.expires_at > current_time]
 
-        # Sort by priority (higher priority first) then by creation time (newer first)
-        priority_order = {
-            NotificationPriority.CRITICAL: 0,
-            NotificationPriority.URGENT: 1,
-            NotificationPriority.HIGH: 2,
-            NotificationPriority.MEDIUM: 3,
-            NotificationPriority.LOW: 4
-        }
+        if not sort:
+            return unread
 
-        return sorted(unread, key=lambda n: (priority_order.get(n.priority, 999), -n.created_at.timestamp()))
+        # Sort by priority (higher priority first) then by creation time (newer first)
+        return sorted(unread, key=lambda n: (_NOTIFICATION_PRIORITY_ORDER.get(n.priority, 999),
+                                             -n.created_at.timestamp()))
 
     def get_notifications_by_category(self, category: NotificationCategory) -> List[Notification]:
         """Get notifications by category"""
@@ -686,16 +700,13 @@ class SmartNotificationManager:
         total_notifications = len(self.notification_history)
 
         # Type distribution
-        type_counts = {}
-        for entry in self.notification_history:
-            type_counts[entry['type']] = type_counts.get(entry['type'], 0) + 1
+        type_counts = Counter(entry['type'] for entry in self.notification_history)
 
         # Daily pattern
-        daily_counts = {}
+        daily_counts = Counter()
         for entry in self.notification_history:
             try:
-                created_date = datetime.fromisoformat(entry['created_at']).date()
-                daily_counts[created_date.isoformat()] = daily_counts.get(created_date.isoformat(), 0) + 1
+                daily_counts[datetime.fromisoformat(entry['created_at']).date().isoformat()] += 1
             except:
                 continue
 
@@ -707,8 +718,8 @@ class SmartNotificationManager:
 
         return {
             'total_notifications': total_notifications,
-            'type_distribution': type_counts,
-            'daily_pattern': daily_counts,
+            'type_distribution': dict(type_counts),
+            'daily_pattern': dict(daily_counts),
             'interaction_rate': interaction_rate,
             'average_per_day': total_notifications / max(1, len(set(daily_counts.keys())))
         }
@@ -769,7 +780,8 @@ class SmartNotificationManager:
                 continue  # Skip malformed notifications
 
         # Load history
-        self.notification_history = st.session_state.get('notification_history', [])
+        history = st.session_state.get('notification_history', [])
+        self.notification_history = history if isinstance(history, deque) else deque(history, maxlen=1000)
 
 
 def render_enhanced_notification_center():
@@ -793,22 +805,13 @@ def render_enhanced_notification_center():
     col2.metric("Total Active", total_count)
 
     # Category breakdown
-    category_counts = {}
-    for notification in unread_notifications:
-        cat = notification.category.value
-        category_counts[cat] = category_counts.get(cat, 0) + 1
+    category_counts = Counter(notification.category.value for notification in unread_notifications)
 
     col3.metric("Categories", len(category_counts))
 
-    # Show highest priority
+    # Show highest priority; unread notifications are already sorted highest priority first
     if unread_notifications:
-        highest_priority = max(unread_notifications, key=lambda n: {
-            NotificationPriority.CRITICAL: 5,
-            NotificationPriority.URGENT: 4,
-            NotificationPriority.HIGH: 3,
-            NotificationPriority.MEDIUM: 2,
-            NotificationPriority.LOW: 1
-        }.get(n.priority, 0))
+        highest_priority = unread_notifications[0]
         col4.metric("Highest Priority", highest_priority.priority.value.title())
 
     # Quick actions
@@ -875,15 +878,17 @@ def render_enhanced_notification_center():
         else:
             st.markdown(f"#### {len(filtered_notifications)} Notifications")
 
+            now = datetime.now()
             for notification in filtered_notifications:
-                render_notification_card(notification, manager)
+                render_notification_card(notification, manager, now)
 
     # Notification preferences
     with st.expander("⚙️ Notification Settings"):
         render_notification_preferences(manager)
 
 
-def render_notification_card(notification: Notification, manager: SmartNotificationManager):
+def render_notification_card(notification: Notification, manager: SmartNotificationManager,
+                             now: Optional[datetime] = None):
     """Render an individual notification card"""
     # Priority and type indicators
     priority_colors = {
@@ -927,7 +932,7 @@ def render_notification_card(notification: Notification, manager: SmartNotificat
             st.markdown(notification.message)
 
             # Show metadata
-            time_ago = get_time_ago(notification.created_at)
+            time_ago = get_time_ago(notification.created_at, now)
             category = notification.category.value.title()
             st.markdown(f"<small>{category} • {time_ago}</small>", unsafe_allow_html=True)
 
@@ -1049,10 +1054,9 @@ def render_notification_preferences(manager: SmartNotificationManager):
         st.rerun()
 
 
-def get_time_ago(timestamp: datetime) -> str:
-    """Get human-readable time ago string"""
-    now = datetime.now()
-    diff = now - timestamp
+def get_time_ago(timestamp: datetime, now: Optional[datetime] = None) -> str:
+    """Get human-readable time ago string, relative to ``now`` when the caller already has it"""
+    diff = (now or datetime.now()) - timestamp
 
     if diff.days > 0:
         return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
@@ -1072,14 +1076,12 @@ def get_notification_badge_count() -> int:
         return 0
 
     manager = st.session_state.smart_notification_manager
-    unread = manager.get_unread_notifications()
+    # The badge only needs a count, so the unread list is not sorted
+    unread = manager.get_unread_notifications(sort=False)
 
     # Count only high-priority unread notifications for badge
-    high_priority_unread = [n for n in unread
-                            if n.priority in [NotificationPriority.HIGH, NotificationPriority.URGENT,
-                                              NotificationPriority.CRITICAL]]
-
-    return len(high_priority_unread)
+    badge_priorities = {NotificationPriority.HIGH, NotificationPriority.URGENT, NotificationPriority.CRITICAL}
+    return sum(1 for n in unread if n.priority in badge_priorities)
 
 
 def init_smart_notification_system():
@@ -1150,31 +1152,24 @@ def generate_weekly_summary():
 
     manager = st.session_state.smart_notification_manager
 
+    # Shared parse cache: timestamps seen on earlier renders are not parsed again
+    from utils import parse_iso_datetime
+
     # Calculate comprehensive weekly stats
     week_start = date.today() - timedelta(days=date.today().weekday())
     week_end = week_start + timedelta(days=6)
 
+    def in_week(value: Optional[str]) -> bool:
+        parsed = parse_iso_datetime(value)  # None for missing or invalid values
+        return parsed is not None and week_start <= parsed.date() <= week_end
+
     # Tasks completed this week
-    weekly_tasks = []
-    for task in st.session_state.get('tasks', []):
-        if task.get('completed_at'):
-            try:
-                completed_date = datetime.fromisoformat(task['completed_at']).date()
-                if week_start <= completed_date <= week_end:
-                    weekly_tasks.append(task)
-            except:
-                continue
+    weekly_tasks = [task for task in st.session_state.get('tasks', []) if in_week(task.get('completed_at'))]
 
     # Habits completed this week
-    weekly_habit_completions = 0
-    for habit in st.session_state.get('habits', []):
-        for completion_date_str in habit.get('completion_dates', []):
-            try:
-                completion_date = datetime.fromisoformat(completion_date_str).date()
-                if week_start <= completion_date <= week_end:
-                    weekly_habit_completions += 1
-            except:
-                continue
+    weekly_habit_completions = sum(in_week(completion_date_str)
+                                   for habit in st.session_state.get('habits', [])
+                                   for completion_date_str in habit.get('completion_dates', []))
 
     # Pomodoro sessions
     weekly_pomodoros = st.session_state.get('pomodoro_state', {}).get('sessions_completed', 0)
@@ -402,6 +402,7 @@ class SetupManager:
             ("Import plotly", lambda: __import__("plotly")),
             ("Check data directory", lambda: (self.app_dir / "data").exists()),
             ("Check config directory", lambda: (self.app_dir / "config").exists()),
+            ("Parse naive and timezone-aware task timestamps", self._check_task_timestamps),
         ]
 
         passed = 0
@@ -423,6 +424,27 @@ class SetupManager:
         if passed < total:
             print(f"  ⚠️ Some tests failed - application may have limited functionality")
 
+    def _check_task_timestamps(self) -> bool:
+        """Check that the task store parses mixed and all-aware timestamps to comparable naive values"""
+
+        from utils import TaskStore
+
+        samples = [
+            ["2024-01-01T10:00:00", "2024-01-02T10:00:00+02:00", None],
+            ["2024-01-02T08:00:00Z", "2024-01-02T10:00:00+02:00"],
+        ]
+
+        for created in samples:
+            store = TaskStore([{'id': str(i), 'created_at': value} for i, value in enumerate(created)])
+            parsed = store.frame['created_ts']
+            if parsed.dt.tz is not None or parsed.iloc[1] != datetime(2024, 1, 2, 8, 0):
+                return False
+            # The period masks compare against naive timestamps
+            if not parsed.dt.normalize().between(datetime(2024, 1, 1), datetime(2024, 1, 31)).iloc[:2].all():
+                return False
+
+        return True
+
     def _create_shortcuts(self):
         """Create desktop shortcuts and launch scripts"""
 
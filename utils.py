@@ -1,9 +1,21 @@
 import streamlit as st
+import pandas as pd
+import numpy as np
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Any, Callable, Union
+import copy
 import json
 import uuid
+import calendar
+import re
 from enum import Enum
+from functools import lru_cache
+from collections import OrderedDict, defaultdict, namedtuple
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso  # Optional C parser, much faster than stdlib
+except ImportError:
+    _parse_iso = datetime.fromisoformat
 
 
 class Priority(Enum):
@@ -53,42 +65,58 @@ class Habit:
         self.best_streak = 0
 
 
+_SESSION_DEFAULTS = {
+    'tasks': [],
+    'lists': ["Inbox", "Personal", "Work", "Shopping", "Health"],
+    'habits': [],
+    'current_view': "tasks",
+    'current_filter': "all",
+    'pomodoro_state': {
+        'active': False,
+        'start_time': None,
+        'duration': 25,
+        'current_type': 'work',
+        'sessions_completed': 0
+    },
+    'folders': ["Personal", "Work", "Projects"],
+    'app_settings': {
+        'theme': 'default',
+        'language': 'en',
+        'notifications': True,
+        'auto_save': True
+    }
+}
+
+
 def init_session_state():
     """Initialize all session state variables"""
-    if 'tasks' not in st.session_state:
-        st.session_state.tasks = []
+    # Called at the top of every script run, so per-run memos start empty here
+    st.session_state.tasks_fingerprint_memo = {}
 
-    if 'lists' not in st.session_state:
-        st.session_state.lists = ["Inbox", "Personal", "Work", "Shopping", "Health"]
+    # Defaults only need filling once per session; later reruns skip the walk
+    if st.session_state.get('_session_initialized'):
+        return
 
-    if 'habits' not in st.session_state:
-        st.session_state.habits = []
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.deepcopy(default)  # Never share the mutable defaults
 
-    if 'current_view' not in st.session_state:
-        st.session_state.current_view = "tasks"
+    st.session_state._session_initialized = True
 
-    if 'current_filter' not in st.session_state:
-        st.session_state.current_filter = "all"
 
-    if 'pomodoro_state' not in st.session_state:
-        st.session_state.pomodoro_state = {
-            'active': False,
-            'start_time': None,
-            'duration': 25,
-            'current_type': 'work',
-            'sessions_completed': 0
-        }
+def _find_position(collection: str, item_id: str) -> Optional[int]:
+    """Position of the task or habit with this id in its session-state list, via a cached id index"""
+    items = st.session_state[collection]
+    index = st.session_state.setdefault(f'{collection}_id_index', {})
 
-    if 'folders' not in st.session_state:
-        st.session_state.folders = ["Personal", "Work", "Projects"]
-
-    if 'app_settings' not in st.session_state:
-        st.session_state.app_settings = {
-            'theme': 'default',
-            'language': 'en',
-            'notifications': True,
-            'auto_save': True
-        }
+    # The index is checked against the list on every lookup and rebuilt whenever it is stale
+    position = index.get(item_id)
+    if position is None or position >= len(items) or items[position]['id'] != item_id:
+        index.clear()
+        for i, item in enumerate(items):
+            index.setdefault(item['id'], i)  # First occurrence wins, as with a linear scan
+        position = index.get(item_id)
+    return position
 
 
 def add_task(title: str, description: str = "", due_date: Optional[date] = None,
@@ -97,121 +125,332 @@ def add_task(title: str, description: str = "", due_date: Optional[date] = None,
     """Add a new task and return its ID"""
     task = Task(title, description, due_date, priority, list_name, tags, subtasks)
     st.session_state.tasks.append(task.__dict__)
+    bump_tasks_version()
     return task.id
 
 
 def update_task(task_id: str, **kwargs) -> bool:
     """Update a task with given parameters"""
-    for task in st.session_state.tasks:
-        if task['id'] == task_id:
-            for key, value in kwargs.items():
-                if key in task:
-                    task[key] = value
-            return True
-    return False
+    task = get_task_by_id(task_id)
+    if task is None:
+        return False
+
+    for key, value in kwargs.items():
+        if key in task:
+            task[key] = value
+    bump_tasks_version()
+    return True
 
 
 def complete_task(task_id: str) -> bool:
     """Mark a task as completed"""
+    task = get_task_by_id(task_id)
+    if task is None:
+        return False
+
+    task['status'] = TaskStatus.COMPLETED.value
+    task['completed_at'] = datetime.now().isoformat()
+    bump_tasks_version()
+    return True
+
+
+def complete_tasks(task_ids) -> int:
+    """Mark several tasks as completed in one pass, returning how many were updated"""
+    task_ids = set(task_ids)
+    completed_at = datetime.now().isoformat()
+    updated = 0
     for task in st.session_state.tasks:
-        if task['id'] == task_id:
+        if task['id'] in task_ids:
             task['status'] = TaskStatus.COMPLETED.value
-            task['completed_at'] = datetime.now().isoformat()
-            return True
-    return False
+            task['completed_at'] = completed_at
+            updated += 1
+    bump_tasks_version()
+    return updated
 
 
 def uncomplete_task(task_id: str) -> bool:
     """Mark a completed task as pending"""
-    for task in st.session_state.tasks:
-        if task['id'] == task_id:
-            task['status'] = TaskStatus.PENDING.value
-            task['completed_at'] = None
-            return True
-    return False
+    task = get_task_by_id(task_id)
+    if task is None:
+        return False
+
+    task['status'] = TaskStatus.PENDING.value
+    task['completed_at'] = None
+    bump_tasks_version()
+    return True
 
 
 def delete_task(task_id: str) -> bool:
     """Delete a task"""
-    original_count = len(st.session_state.tasks)
+    if _find_position('tasks', task_id) is None:
+        return False
+
+    # Filter rather than slice out one position, so duplicated ids (e.g. after an import) all go
     st.session_state.tasks = [t for t in st.session_state.tasks if t['id'] != task_id]
-    return len(st.session_state.tasks) < original_count
+    return True
 
 
 def get_task_by_id(task_id: str) -> Optional[Dict]:
     """Get a task by its ID"""
-    for task in st.session_state.tasks:
-        if task['id'] == task_id:
-            return task
-    return None
+    position = _find_position('tasks', task_id)
+    return None if position is None else st.session_state.tasks[position]
+
+
+def bump_tasks_version():
+    """Mark the tasks as changed so their fingerprints are recomputed within the current run"""
+    st.session_state.tasks_version = st.session_state.get('tasks_version', 0) + 1
+
+
+def get_tasks_fingerprint(tasks: List[Dict]) -> int:
+    """Content hash of a task list, used to key derived caches
+
+    The hash walks every task, so it is memoized per list for the rest of the script run and
+    recomputed only when the list length or tasks_version (bumped by the task mutators) changes.
+    """
+    memo = st.session_state.setdefault('tasks_fingerprint_memo', {})
+    version = st.session_state.get('tasks_version', 0)
+
+    # The memo keeps a reference to each list, so an id is never reused while its entry exists
+    entry = memo.get(id(tasks))
+    if entry is None or entry[0] is not tasks or entry[1] != len(tasks) or entry[2] != version:
+        if len(memo) >= 64:
+            memo.clear()  # Fragment reruns skip init_session_state; don't let filtered lists pile up
+        fingerprint = hash(tuple(
+            (t.get('id'), t.get('title'), t.get('description'), t.get('status'), t.get('priority'),
+             t.get('list_name'), t.get('due_date'), t.get('created_at'), t.get('completed_at'),
+             t.get('estimated_time'), t.get('actual_time'), tuple(t.get('tags') or ()))
+            for t in tasks
+        ))
+        entry = memo[id(tasks)] = (tasks, len(tasks), version, fingerprint)
+    return entry[3]
+
+
+def get_habits_fingerprint(habits: List[Dict]) -> int:
+    """Cheap content hash of a habit list, used to key derived caches"""
+    return hash(tuple(
+        (h.get('id'), h.get('name'), h.get('active', True), h.get('streak'), h.get('best_streak'),
+         tuple(h.get('completion_dates') or ()))
+        for h in habits
+    ))
+
+
+def get_cached(cache_name: str, key: Any, builder: Callable[[], Any], max_entries: int = 4) -> Any:
+    """Return builder(), cached in session state under a hashable key"""
+    cache = st.session_state.get(cache_name)
+    if not isinstance(cache, OrderedDict):
+        cache = st.session_state[cache_name] = OrderedDict(cache or ())
+
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    # A few variants (e.g. the full list and a filtered subset) are kept; the least recently used goes first
+    value = cache[key] = builder()
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+    return value
+
+
+def get_cached_for_tasks(cache_name: str, tasks: List[Dict], builder: Callable[[List[Dict]], Any],
+                         max_entries: int = 4, extra_key: Any = None) -> Any:
+    """Return builder(tasks), cached in session state until the task list content or extra_key changes"""
+    fingerprint = (get_tasks_fingerprint(tasks), extra_key)
+    return get_cached(cache_name, fingerprint, lambda: builder(tasks), max_entries)
+
+
+class TaskStore:
+    """Columnar (DataFrame) view of a task list shared by the analyzers"""
+
+    COLUMNS = ['id', 'title', 'priority', 'list_name', 'status', 'due_date', 'created_at',
+               'completed_at', 'tags', 'estimated_time', 'actual_time']
+    PRIORITY_ORDER = ['high', 'medium', 'low', 'none']
+
+    def __init__(self, tasks: List[Dict]):
+        self.tasks = tasks
+        self.frame = pd.DataFrame(tasks, columns=self.COLUMNS)
+
+        # Low-cardinality columns as categoricals; priority is ordered high -> none
+        extra_priorities = sorted(set(self.frame['priority'].dropna()) - set(self.PRIORITY_ORDER))
+        self.frame['priority'] = self.frame['priority'].astype(
+            pd.CategoricalDtype(self.PRIORITY_ORDER + extra_priorities, ordered=True))
+        self.frame['status'] = self.frame['status'].astype('category')
+        self.frame['list_name'] = self.frame['list_name'].astype('category')
+
+        self.frame['created_ts'] = self.parse_timestamps(self.frame['created_at'])
+        self.frame['completed_ts'] = self.parse_timestamps(self.frame['completed_at'])
+        self.frame['due_ts'] = self.parse_timestamps(self.frame['due_date'])
+        self._due_days = None
+        self._due_days_for = None
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def rows(self, mask) -> List[Dict]:
+        """Get the task dicts selected by a boolean mask over the frame"""
+        return [self.tasks[i] for i in np.flatnonzero(np.asarray(mask))]
+
+    def due_days(self, today: date) -> np.ndarray:
+        """Days from today until each task is due (NaN without a valid due date), computed once per day"""
+        if self._due_days_for != today:
+            due_day = self.frame['due_ts'].dt.normalize()
+            self._due_days = ((due_day - pd.Timestamp(today)) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+            self._due_days_for = today
+        return self._due_days
+
+    @staticmethod
+    def parse_timestamps(column: pd.Series) -> pd.Series:
+        """Parse ISO strings to naive timestamps (NaT if invalid); aware values are converted to UTC first"""
+        return pd.to_datetime(column, errors='coerce', format='ISO8601', utc=True).dt.tz_convert(None)
+
+    @staticmethod
+    def count_values(column: pd.Series) -> Dict:
+        """Count occurrences of each value, leaving out unused categories"""
+        counts = column.value_counts()
+        return counts[counts > 0].to_dict()
+
+    @staticmethod
+    def of(tasks: Union[List[Dict], 'TaskStore']) -> 'TaskStore':
+        """Get the store for a task list, rebuilt only when the list content changes"""
+        if isinstance(tasks, TaskStore):
+            return tasks
+        return get_cached_for_tasks('task_store_cache', tasks, TaskStore)
+
+
+def get_tasks_by(tasks: List[Dict], field: str) -> Dict[Any, List[Dict]]:
+    """Group tasks by a field value (e.g. status or list_name), cached until the task list content changes"""
+    def build(task_list: List[Dict]) -> Dict[Any, List[Dict]]:
+        groups = defaultdict(list)
+        for task in task_list:
+            groups[task.get(field)].append(task)
+        return dict(groups)
+
+    return get_cached_for_tasks('task_index_cache', tasks, build, max_entries=8, extra_key=field)
+
+
+def get_habit_completion_counts(completion_dates: List[str], window_days: int = 30) -> Dict[str, int]:
+    """Count a habit's total and recent completions, cached until its completion dates change"""
+    today = date.today()
+
+    def build() -> Dict[str, int]:
+        # ISO date strings sort chronologically, so the window is a plain string comparison
+        cutoff = (today - timedelta(days=window_days)).isoformat()
+        days = np.asarray(completion_dates, dtype=str)
+        return {'total': len(days), 'recent': int((days >= cutoff).sum())}
+
+    return get_cached('habit_counts_cache', (tuple(completion_dates), window_days, today), build, max_entries=256)
+
+
+@lru_cache(maxsize=4)
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from an inline <style> block"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.strip()
+
+
+PlotlyModules = namedtuple('PlotlyModules', ['px', 'go'])
+
+
+@lru_cache(maxsize=1)
+def load_plotly() -> PlotlyModules:
+    """Import plotly.express and plotly.graph_objects on first use, keeping them off the startup path"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    return PlotlyModules(px, go)
+
+
+@lru_cache(maxsize=8192)
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date/datetime string once, returning None if it is missing or invalid"""
+    if not value:
+        return None
+    try:
+        return _parse_iso(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def prime_task_timestamps(tasks: List[Dict]):
+    """Parse task timestamps once at load time so later lookups hit the parse cache"""
+    for task in tasks:
+        for field in ('created_at', 'completed_at', 'due_date'):
+            parse_iso_datetime(task.get(field))
 
 
 def get_tasks_by_filter(filter_type: str) -> List[Dict]:
     """Get tasks based on filter type"""
-    tasks = st.session_state.tasks.copy()
-    today = date.today().isoformat()
-    tomorrow = (date.today() + timedelta(days=1)).isoformat()
-    week_end = (date.today() + timedelta(days=7)).isoformat()
-
+    tasks = st.session_state.tasks
     if filter_type == "all":
-        return tasks
-    elif filter_type == "today":
-        return [t for t in tasks if t['due_date'] == today]
+        return tasks.copy()
+
+    # Filters are boolean masks over the cached columnar view of the session task list itself,
+    # so its fingerprint is memoized for the run
+    store = TaskStore.of(tasks)
+    df = store.frame
+    due_days = store.due_days(date.today())
+
+    if filter_type == "today":
+        mask = due_days == 0
     elif filter_type == "tomorrow":
-        return [t for t in tasks if t['due_date'] == tomorrow]
+        mask = due_days == 1
     elif filter_type == "this_week":
-        return [t for t in tasks if t['due_date'] and t['due_date'] <= week_end]
+        mask = due_days <= 7
     elif filter_type == "overdue":
-        return [t for t in tasks if t['due_date'] and t['due_date'] < today
-                and t['status'] == TaskStatus.PENDING.value]
+        mask = (due_days < 0) & (df['status'] == TaskStatus.PENDING.value).to_numpy()
     elif filter_type == "high_priority":
-        return [t for t in tasks if t['priority'] == Priority.HIGH.value]
+        mask = df['priority'] == Priority.HIGH.value
     elif filter_type == "completed":
-        return [t for t in tasks if t['status'] == TaskStatus.COMPLETED.value]
+        mask = df['status'] == TaskStatus.COMPLETED.value
     elif filter_type in st.session_state.lists:
-        return [t for t in tasks if t['list_name'] == filter_type]
+        mask = df['list_name'] == filter_type
     else:
-        return tasks
+        return tasks.copy()
+    return store.rows(mask)
 
 
 def get_task_stats() -> Dict:
-    """Get comprehensive task statistics"""
-    tasks = st.session_state.tasks
-    total = len(tasks)
-    completed = len([t for t in tasks if t['status'] == TaskStatus.COMPLETED.value])
-    pending = total - completed
-
-    today = date.today().isoformat()
-    overdue = len([t for t in tasks
-                   if t['due_date'] and t['due_date'] < today
-                   and t['status'] == TaskStatus.PENDING.value])
-
-    due_today = len([t for t in tasks if t['due_date'] == today])
-
-    # Priority distribution
-    priority_stats = {}
-    for priority in Priority:
-        priority_stats[priority.value] = len([t for t in tasks if t['priority'] == priority.value])
-
-    # List distribution
-    list_stats = {}
-    for list_name in st.session_state.lists:
-        list_tasks = [t for t in tasks if t['list_name'] == list_name]
-        list_stats[list_name] = {
-            'total': len(list_tasks),
-            'completed': len([t for t in list_tasks if t['status'] == TaskStatus.COMPLETED.value])
+    """Get comprehensive task statistics, cached until the tasks, lists or date change"""
+    def build(tasks: List[Dict]) -> Dict:
+        store = TaskStore.of(tasks)
+        df = store.frame
+        total = len(df)
+
+        completed_mask = df['status'] == TaskStatus.COMPLETED.value
+        completed = int(completed_mask.sum())
+        pending = total - completed
+
+        due_days = store.due_days(date.today())
+        overdue = int(((due_days < 0) & (df['status'] == TaskStatus.PENDING.value).to_numpy()).sum())
+
+        due_today = int((due_days == 0).sum())
+
+        # Priority and list distributions from value counts on the categorical columns
+        priority_counts = TaskStore.count_values(df['priority'])
+        list_totals = TaskStore.count_values(df['list_name'])
+        list_completed = TaskStore.count_values(df.loc[completed_mask, 'list_name'])
+        list_pending = TaskStore.count_values(df.loc[df['status'] == TaskStatus.PENDING.value, 'list_name'])
+
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": pending,
+            "overdue": overdue,
+            "due_today": due_today,
+            "completion_rate": (completed / total * 100) if total > 0 else 0,
+            "priority_stats": {priority.value: int(priority_counts.get(priority.value, 0)) for priority in Priority},
+            "list_stats": {list_name: {'total': int(list_totals.get(list_name, 0)),
+                                       'completed': int(list_completed.get(list_name, 0)),
+                                       'pending': int(list_pending.get(list_name, 0))}
+                           for list_name in st.session_state.lists}
         }
 
-    return {
-        "total": total,
-        "completed": completed,
-        "pending": pending,
-        "overdue": overdue,
-        "due_today": due_today,
-        "completion_rate": (completed / total * 100) if total > 0 else 0,
-        "priority_stats": priority_stats,
-        "list_stats": list_stats
-    }
+    return get_cached_for_tasks('task_stats_cache', st.session_state.tasks, build,
+                                extra_key=(date.today(), tuple(st.session_state.lists)))
 
 
 def add_habit(name: str, frequency: str = "daily", target: int = 1,
@@ -222,6 +461,19 @@ def add_habit(name: str, frequency: str = "daily", target: int = 1,
     return habit.id
 
 
+def get_habit_date_set(habit: Dict) -> frozenset:
+    """A habit's completion dates as a set, cached in session state until its completion list changes"""
+    dates = habit.get('completion_dates') or []
+    cache = st.session_state.setdefault('habit_date_sets', {})
+
+    # Entries hold the list they were built from, so a replaced or resized list is always detected;
+    # complete_habit and uncomplete_habit drop the entry for same-length edits
+    entry = cache.get(habit.get('id'))
+    if entry is None or entry[0] is not dates or entry[1] != len(dates):
+        entry = cache[habit.get('id')] = (dates, len(dates), frozenset(dates))
+    return entry[2]
+
+
 def complete_habit(habit_id: str, completion_date: date = None) -> bool:
     """Mark a habit as completed for a specific date"""
     if not completion_date:
@@ -229,13 +481,13 @@ def complete_habit(habit_id: str, completion_date: date = None) -> bool:
 
     date_str = completion_date.isoformat()
 
-    for habit in st.session_state.habits:
-        if habit['id'] == habit_id:
-            if date_str not in habit['completion_dates']:
-                habit['completion_dates'].append(date_str)
-                habit['completion_dates'].sort()
-                update_habit_streak(habit_id)
-                return True
+    habit = get_habit_by_id(habit_id)
+    if habit is not None and date_str not in get_habit_date_set(habit):
+        habit['completion_dates'].append(date_str)
+        habit['completion_dates'].sort()
+        st.session_state.habit_date_sets.pop(habit_id, None)
+        update_habit_streak(habit_id)
+        return True
     return False
 
 
@@ -246,43 +498,55 @@ def uncomplete_habit(habit_id: str, completion_date: date = None) -> bool:
 
     date_str = completion_date.isoformat()
 
-    for habit in st.session_state.habits:
-        if habit['id'] == habit_id:
-            if date_str in habit['completion_dates']:
-                habit['completion_dates'].remove(date_str)
-                update_habit_streak(habit_id)
-                return True
+    habit = get_habit_by_id(habit_id)
+    if habit is not None and date_str in get_habit_date_set(habit):
+        habit['completion_dates'].remove(date_str)
+        st.session_state.habit_date_sets.pop(habit_id, None)
+        update_habit_streak(habit_id)
+        return True
     return False
 
 
 def update_habit_streak(habit_id: str):
     """Update the streak for a habit"""
-    for habit in st.session_state.habits:
-        if habit['id'] == habit_id:
-            if not habit['completion_dates']:
-                habit['streak'] = 0
-                return
+    habit = get_habit_by_id(habit_id)
+    if habit is None:
+        return
 
-            # Calculate current streak
-            today = date.today()
-            current_streak = 0
+    if not habit['completion_dates']:
+        habit['streak'] = 0
+        return
 
-            for i in range(100):  # Check last 100 days
-                check_date = (today - timedelta(days=i)).isoformat()
-                if check_date in habit['completion_dates']:
-                    current_streak += 1
-                else:
-                    break
+    # Calculate current streak
+    today = date.today()
+    current_streak = 0
+    completed = get_habit_date_set(habit)  # O(1) membership per day instead of a list scan
+
+    for i in range(100):  # Check last 100 days
+        check_date = (today - timedelta(days=i)).isoformat()
+        if check_date in completed:
+            current_streak += 1
+        else:
+            break
 
-            habit['streak'] = current_streak
-            habit['best_streak'] = max(habit.get('best_streak', 0), current_streak)
+    habit['streak'] = current_streak
+    habit['best_streak'] = max(habit.get('best_streak', 0), current_streak)
 
 
 def delete_habit(habit_id: str) -> bool:
     """Delete a habit"""
-    original_count = len(st.session_state.habits)
+    if _find_position('habits', habit_id) is None:
+        return False
+
+    # Filter rather than slice out one position, so duplicated ids (e.g. after an import) all go
     st.session_state.habits = [h for h in st.session_state.habits if h['id'] != habit_id]
-    return len(st.session_state.habits) < original_count
+    return True
+
+
+def get_habit_by_id(habit_id: str) -> Optional[Dict]:
+    """Get a habit by its ID"""
+    position = _find_position('habits', habit_id)
+    return None if position is None else st.session_state.habits[position]
 
 
 def get_habit_stats() -> Dict:
@@ -293,10 +557,14 @@ def get_habit_stats() -> Dict:
     if total_habits == 0:
         return {"total": 0, "completed_today": 0, "completion_rate": 0, "average_streak": 0}
 
+    # Single pass over the habits for both counters
     today = date.today().isoformat()
-    completed_today = len([h for h in habits if today in h['completion_dates']])
+    completed_today = 0
+    total_streaks = 0
+    for h in habits:
+        completed_today += today in get_habit_date_set(h)
+        total_streaks += h.get('streak', 0)
 
-    total_streaks = sum(h.get('streak', 0) for h in habits)
     average_streak = total_streaks / total_habits if total_habits > 0 else 0
 
     return {
@@ -365,6 +633,7 @@ def import_data(data_str: str, format_type: str = "json") -> bool:
 
             if "tasks" in data:
                 st.session_state.tasks = data["tasks"]
+                prime_task_timestamps(st.session_state.tasks)
             if "habits" in data:
                 st.session_state.habits = data["habits"]
             if "lists" in data:
@@ -379,31 +648,27 @@ def import_data(data_str: str, format_type: str = "json") -> bool:
     return False
 
 
-def search_tasks(query: str) -> List[Dict]:
-    """Search tasks by title, description, or tags"""
-    if not query:
-        return st.session_state.tasks
-
-    query = query.lower()
-    results = []
+def search_tasks(query: str, status: Optional[str] = None) -> List[Dict]:
+    """Search tasks by title, description, or tags, optionally only among tasks with the given status"""
+    tasks = st.session_state.tasks
 
-    for task in st.session_state.tasks:
-        # Search in title
-        if query in task['title'].lower():
-            results.append(task)
-            continue
+    # The status filter runs first so only tasks that can be shown are matched against the query
+    if status is None:
+        candidates = np.arange(len(tasks))
+    else:
+        candidates = np.flatnonzero((TaskStore.of(tasks).frame['status'] == status).to_numpy())
 
-        # Search in description
-        if task['description'] and query in task['description'].lower():
-            results.append(task)
-            continue
+    if not query:
+        return list(tasks) if status is None else [tasks[i] for i in candidates]
 
-        # Search in tags
-        if any(query in tag.lower() for tag in task['tags']):
-            results.append(task)
-            continue
+    # Title, description and tags are lowered and joined once per task list; the NUL separator
+    # keeps a match from spanning two fields. A plain list keeps memory at the real text size
+    def build(task_list: List[Dict]) -> List[str]:
+        return ['\0'.join([t['title'], t['description'] or '', *t['tags']]).lower() for t in task_list]
 
-    return results
+    search_text = get_cached_for_tasks('search_text_cache', tasks, build)
+    query = query.lower()
+    return [tasks[i] for i in candidates if query in search_text[i]]
 
 
 def get_productivity_insights() -> Dict:
@@ -412,31 +677,27 @@ def get_productivity_insights() -> Dict:
     habits = st.session_state.habits
 
     # Task insights
-    completed_tasks = [t for t in tasks if t['status'] == TaskStatus.COMPLETED.value]
+    completed_tasks = get_tasks_by(tasks, 'status').get(TaskStatus.COMPLETED.value, [])
 
     # Completion times analysis
-    completion_hours = []
-    for task in completed_tasks:
-        if task['completed_at']:
-            completed_time = datetime.fromisoformat(task['completed_at'])
-            completion_hours.append(completed_time.hour)
+    completed_times = [parse_iso_datetime(task['completed_at']) for task in completed_tasks if task['completed_at']]
+    completed_times = [dt for dt in completed_times if dt]
 
-    most_productive_hour = max(set(completion_hours), key=completion_hours.count) if completion_hours else None
+    # Count per hour in a single pass; ties go to the earliest hour
+    hour_counts = np.bincount([dt.hour for dt in completed_times], minlength=24)
+    most_productive_hour = int(hour_counts.argmax()) if completed_times else None
 
     # Weekly completion pattern
-    weekly_completions = {}
-    for task in completed_tasks:
-        if task['completed_at']:
-            completed_date = datetime.fromisoformat(task['completed_at'])
-            day_name = completed_date.strftime('%A')
-            weekly_completions[day_name] = weekly_completions.get(day_name, 0) + 1
+    weekday_counts = np.bincount([dt.weekday() for dt in completed_times], minlength=7)
+    weekly_completions = {calendar.day_name[day]: int(count) for day, count in enumerate(weekday_counts) if count}
 
     most_productive_day = max(weekly_completions, key=weekly_completions.get) if weekly_completions else None
 
     # Habit insights
     habit_completion_rates = []
+    today = date.today()
     for habit in habits:
-        total_days = max(1, (date.today() - datetime.fromisoformat(habit['created_at']).date()).days)
+        total_days = max(1, (today - parse_iso_datetime(habit['created_at']).date()).days)
         completion_rate = len(habit['completion_dates']) / total_days * 100
         habit_completion_rates.append(completion_rate)
 
@@ -454,12 +715,17 @@ def get_productivity_insights() -> Dict:
 
 def format_date_display(date_str: str) -> str:
     """Format date string for display"""
+    return _format_date_for_day(date_str, date.today())
+
+
+@lru_cache(maxsize=1024)
+def _format_date_for_day(date_str: str, today: date) -> str:
+    """Format date string relative to the given day, memoized per (date, day)"""
     if not date_str:
         return "No date"
 
     try:
         date_obj = datetime.fromisoformat(date_str).date()
-        today = date.today()
 
         if date_obj == today:
             return "Today"
@@ -473,15 +739,29 @@ def format_date_display(date_str: str) -> str:
         return date_str
 
 
+@lru_cache(maxsize=256)
+def format_hour(hour: float) -> str:
+    """Format a fractional hour of the day (e.g. 13.25) as HH:MM"""
+    return f"{int(hour):02d}:{int((hour % 1) * 60):02d}"
+
+
+@lru_cache(maxsize=256)
+def format_clock_time(time_str: str) -> str:
+    """Format an HH:MM:SS time string as HH:MM"""
+    return datetime.strptime(time_str, '%H:%M:%S').time().strftime('%H:%M')
+
+
+_PRIORITY_COLORS = {
+    "none": "#95a5a6",
+    "low": "#3498db",
+    "medium": "#f39c12",
+    "high": "#e74c3c"
+}
+
+
 def get_priority_color(priority: str) -> str:
     """Get color for priority level"""
-    colors = {
-        "none": "#95a5a6",
-        "low": "#3498db",
-        "medium": "#f39c12",
-        "high": "#e74c3c"
-    }
-    return colors.get(priority, "#95a5a6")
+    return _PRIORITY_COLORS.get(priority, "#95a5a6")
 
 
 def validate_task_data(title: str, due_date: Optional[date] = None) -> List[str]: